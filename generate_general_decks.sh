@@ -2,7 +2,7 @@
 #
 # Generate general (non-tiered) JLPT Anki decks organized by JLPT level only
 #
-# Uses existing Python scripts:
+# Uses make_decks.py, which loads the dictionaries once and runs:
 #   - create_kanji_decks.py: Generates kanji decks (N5-N1)
 #   - create_vocab_decks.py: Generates vocabulary decks with sentence examples (N5-N1)
 #
@@ -61,31 +61,19 @@ echo ""
 mkdir -p "${KANJI_OUTPUT}"
 mkdir -p "${VOCAB_OUTPUT}"
 
-# Generate Kanji decks
+# Generate Kanji and Vocabulary decks in one run, parsing each dictionary once
 echo "======================================"
 echo "Generating Kanji Decks with Word Examples"
+echo "and Vocabulary Decks with Examples"
 echo "======================================"
 echo ""
 
-python3 "${SCRIPT_DIR}/scripts/create_kanji_decks.py" \
-    --input "${SCRIPT_DIR}/kanjidic2-en-3.6.2.json" \
-    --jmdict "${SCRIPT_DIR}/jmdict-eng-3.6.2.json" \
-    --max-examples 3 \
-    --output-dir "${KANJI_OUTPUT}"
-
-echo ""
-
-# Generate Vocabulary decks with sentence examples
-echo "======================================"
-echo "Generating Vocabulary Decks with Examples"
-echo "======================================"
-echo ""
-
-python3 "${SCRIPT_DIR}/scripts/create_vocab_decks.py" \
+python3 "${SCRIPT_DIR}/scripts/make_decks.py" all \
     --examples \
-    --jmdict-examples "${SCRIPT_DIR}/jmdict-examples-eng-3.6.2.json" \
     --kanjidic "${SCRIPT_DIR}/kanjidic2-en-3.6.2.json" \
-    --output-dir "${VOCAB_OUTPUT}"
+    --jmdict-examples "${SCRIPT_DIR}/jmdict-examples-eng-3.6.2.json" \
+    --max-examples 3 \
+    --output-dir "${OUTPUT_DIR}"
 
 echo ""
 echo "======================================"
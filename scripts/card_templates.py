@@ -7,47 +7,60 @@ Provides styled HTML generation for vocabulary and kanji cards.
 
 from typing import List, Optional, Dict
 
+# Color schemes per JLPT level, shared by all cards
+JLPT_COLORS: Dict[str, Dict[str, str]] = {
+    "N5": {
+        "primary": "#4a90e2",
+        "secondary": "#357abd",
+        "gradient": "#4a90e2,#5ba3f5",
+    },
+    "N4": {
+        "primary": "#11998e",
+        "secondary": "#0d7a6e",
+        "gradient": "#11998e,#38ef7d",
+    },
+    "N3": {
+        "primary": "#f5a623",
+        "secondary": "#d68910",
+        "gradient": "#f5a623,#f7b84e",
+    },
+    "N2": {
+        "primary": "#e74c3c",
+        "secondary": "#c0392b",
+        "gradient": "#e74c3c,#ec7063",
+    },
+    "N1": {
+        "primary": "#9b59b6",
+        "secondary": "#8e44ad",
+        "gradient": "#9b59b6,#af7ac5",
+    },
+    "kana": {
+        "primary": "#34495e",
+        "secondary": "#2c3e50",
+        "gradient": "#34495e,#5d6d7e",
+    },
+    "non_jlpt": {
+        "primary": "#7f8c8d",
+        "secondary": "#616a6b",
+        "gradient": "#7f8c8d,#99a3a4",
+    },
+}
+
+# Tag colors for frequency tiers 1-4 (most to least frequent)
+TIER_COLORS = ("#4caf50", "#8bc34a", "#ffc107", "#ff9800")
+
+# Kanji card stats: (label, value font size, value prefix) for stroke count,
+# radical and frequency rank, in display order
+KANJI_STAT_LABELS = (
+    ("Strokes", "20px", ""),
+    ("Radical", "18px", ""),
+    ("Freq", "16px", "#"),
+)
+
 
 def get_jlpt_colors(jlpt_level: str) -> Dict[str, str]:
     """Get color scheme for a JLPT level."""
-    colors = {
-        "N5": {
-            "primary": "#4a90e2",
-            "secondary": "#357abd",
-            "gradient": "#4a90e2,#5ba3f5",
-        },
-        "N4": {
-            "primary": "#11998e",
-            "secondary": "#0d7a6e",
-            "gradient": "#11998e,#38ef7d",
-        },
-        "N3": {
-            "primary": "#f5a623",
-            "secondary": "#d68910",
-            "gradient": "#f5a623,#f7b84e",
-        },
-        "N2": {
-            "primary": "#e74c3c",
-            "secondary": "#c0392b",
-            "gradient": "#e74c3c,#ec7063",
-        },
-        "N1": {
-            "primary": "#9b59b6",
-            "secondary": "#8e44ad",
-            "gradient": "#9b59b6,#af7ac5",
-        },
-        "kana": {
-            "primary": "#34495e",
-            "secondary": "#2c3e50",
-            "gradient": "#34495e,#5d6d7e",
-        },
-        "non_jlpt": {
-            "primary": "#7f8c8d",
-            "secondary": "#616a6b",
-            "gradient": "#7f8c8d,#99a3a4",
-        },
-    }
-    return colors.get(jlpt_level, colors["N5"])
+    return JLPT_COLORS.get(jlpt_level, JLPT_COLORS["N5"])
 
 
 def create_vocab_front(word: str, readings: str, jlpt_level: str = "N5") -> str:
@@ -181,8 +194,7 @@ def create_vocab_card(
             "<span style='display:inline-block;background:#f3e5f5;color:#7b1fa2;padding:4px 10px;border-radius:12px;font-size:11px;margin:2px'>Common</span>"
         )
     if tier:
-        tier_colors = ["#4caf50", "#8bc34a", "#ffc107", "#ff9800"]
-        tier_color = tier_colors[tier - 1] if tier <= 4 else tier_colors[3]
+        tier_color = TIER_COLORS[tier - 1] if tier <= 4 else TIER_COLORS[3]
         tags_html.append(
             f"<span style='display:inline-block;background:{tier_color}20;color:{tier_color};padding:4px 10px;border-radius:12px;font-size:11px;margin:2px'>Tier {tier}</span>"
         )
@@ -289,19 +301,13 @@ def create_kanji_card(
         readings_html = f"<div style='display:flex;gap:10px;margin-bottom:12px'>{on_section}{kun_section}</div>"
 
     # Build stats section
-    stats_items = []
-    if stroke_count:
-        stats_items.append(
-            f"<div style='text-align:center'><div style='font-size:20px;font-weight:bold;color:{primary}'>{stroke_count}</div><div style='font-size:10px;color:#999'>Strokes</div></div>"
-        )
-    if radical:
-        stats_items.append(
-            f"<div style='text-align:center'><div style='font-size:18px;font-weight:bold;color:{primary}'>{radical}</div><div style='font-size:10px;color:#999'>Radical</div></div>"
-        )
-    if frequency:
-        stats_items.append(
-            f"<div style='text-align:center'><div style='font-size:16px;font-weight:bold;color:{primary}'>#{frequency}</div><div style='font-size:10px;color:#999'>Freq</div></div>"
+    stats_items = "".join(
+        f"<div style='text-align:center'><div style='font-size:{size};font-weight:bold;color:{primary}'>{prefix}{value}</div><div style='font-size:10px;color:#999'>{label}</div></div>"
+        for value, (label, size, prefix) in zip(
+            (stroke_count, radical, frequency), KANJI_STAT_LABELS
         )
+        if value
+    )
 
     stats_html = ""
     if stats_items:
@@ -309,7 +315,7 @@ def create_kanji_card(
         <div style='background:#f8f9fa;padding:12px;border-radius:6px;margin-bottom:12px'>
           <div style='color:#666;font-size:10px;font-weight:600;text-transform:uppercase;margin-bottom:8px'>Stats</div>
           <div style='display:flex;justify-content:space-around'>
-            {"".join(stats_items)}
+            {stats_items}
           </div>
         </div>
         """
@@ -372,8 +378,7 @@ def create_kanji_card(
         f"<span style='display:inline-block;background:#e3f2fd;color:{primary};padding:4px 10px;border-radius:12px;font-size:11px;margin:2px'>{jlpt_level}</span>"
     )
     if tier:
-        tier_colors = ["#4caf50", "#8bc34a", "#ffc107", "#ff9800"]
-        tier_color = tier_colors[tier - 1] if tier <= 4 else tier_colors[3]
+        tier_color = TIER_COLORS[tier - 1] if tier <= 4 else TIER_COLORS[3]
         tags_html.append(
             f"<span style='display:inline-block;background:{tier_color}20;color:{tier_color};padding:4px 10px;border-radius:12px;font-size:11px;margin:2px'>Tier {tier}</span>"
         )
@@ -9,17 +9,25 @@ Usage:
 """
 
 import argparse
-import csv
+import functools
 import json
 import sys
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from jmdict_utils import (
+    EMPTY_DICT,
+    OLD_TO_NEW_JLPT,
     build_kanji_frequency_map,
     calculate_frequency_tiers,
+    consume,
+    extract_reading_meaning,
+    json_loads,
     load_json,
     process_word,
+    require_genanki,
+    write_apkg,
+    write_csv,
 )
 from card_templates import create_kanji_card, create_kanji_front
 
@@ -27,8 +35,8 @@ from card_templates import create_kanji_card, create_kanji_front
 def load_kanjidic(filepath: Path) -> Dict:
     """Load and parse kanjidic2 JSON file with error handling"""
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(filepath, "rb") as f:
+            return json_loads(f.read())
     except FileNotFoundError:
         print(f"Error: File not found: {filepath}", file=sys.stderr)
         sys.exit(1)
@@ -42,46 +50,20 @@ def load_kanjidic(filepath: Path) -> Dict:
 
 def extract_readings(reading_meaning: Optional[Dict]) -> Tuple[List[str], List[str]]:
     """Extract on'yomi and kun'yomi readings"""
-    if not reading_meaning or "groups" not in reading_meaning:
-        return [], []
-
-    on_readings = []
-    kun_readings = []
-
-    for group in reading_meaning.get("groups", []):
-        for reading in group.get("readings", []):
-            rtype = reading.get("type", "")
-            value = reading.get("value", "")
-            if rtype == "ja_on":
-                on_readings.append(value)
-            elif rtype == "ja_kun":
-                kun_readings.append(value)
-
+    on_readings, kun_readings, _ = extract_reading_meaning(reading_meaning)
     return on_readings, kun_readings
 
 
 def extract_meanings(reading_meaning: Optional[Dict], lang: str = "en") -> List[str]:
     """Extract meanings in specified language"""
-    if not reading_meaning or "groups" not in reading_meaning:
-        return []
-
-    meanings = []
-    for group in reading_meaning.get("groups", []):
-        for meaning in group.get("meanings", []):
-            if meaning.get("lang", "en") == lang:
-                value = meaning.get("value")
-                if value:
-                    meanings.append(value)
-
-    return meanings
+    return extract_reading_meaning(reading_meaning, lang)[2]
 
 
 def extract_dict_reference(dict_refs: List[Dict], ref_type: str) -> Optional[str]:
     """Extract a specific dictionary reference value"""
-    for ref in dict_refs:
-        if ref.get("type") == ref_type:
-            return ref.get("value")
-    return None
+    return next(
+        (ref.get("value") for ref in dict_refs if ref.get("type") == ref_type), None
+    )
 
 
 def extract_nanori(reading_meaning: Optional[Dict]) -> List[str]:
@@ -97,19 +79,20 @@ def process_character(char: Dict) -> Optional[Dict]:
     if not literal:
         return None
 
-    misc = char.get("misc", {})
-    reading_meaning = char.get("readingMeaning")
-    dict_refs = char.get("dictionaryReferences", [])
+    misc = char.get("misc", EMPTY_DICT)
 
     # JLPT level (1-4, old system)
     jlpt_level = misc.get("jlptLevel")
 
-    # Skip if no JLPT level
+    # Skip if no JLPT level, before any of the extraction work
     if jlpt_level is None:
         return None
 
+    reading_meaning = char.get("readingMeaning")
+    dict_refs = char.get("dictionaryReferences", ())
+
     # Stroke count
-    stroke_counts = misc.get("strokeCounts", [])
+    stroke_counts = misc.get("strokeCounts", ())
     stroke_count = stroke_counts[0] if stroke_counts else None
 
     # Grade
@@ -118,14 +101,11 @@ def process_character(char: Dict) -> Optional[Dict]:
     # Frequency rank
     frequency = misc.get("frequency")
 
-    # Extract readings
-    on_readings, kun_readings = extract_readings(reading_meaning)
-
-    # Extract meanings
-    meanings = extract_meanings(reading_meaning)
+    # Extract readings and meanings
+    on_readings, kun_readings, meanings = extract_reading_meaning(reading_meaning)
 
     # Get radical
-    radicals = char.get("radicals", [])
+    radicals = char.get("radicals", ())
     radical = None
     if radicals and len(radicals) > 0:
         radical = radicals[0].get("value")
@@ -134,8 +114,9 @@ def process_character(char: Dict) -> Optional[Dict]:
     nanori = extract_nanori(reading_meaning)
 
     # Extract Heisig RTK references
-    heisig = extract_dict_reference(dict_refs, "heisig")
-    heisig6 = extract_dict_reference(dict_refs, "heisig6")
+    refs = {ref.get("type"): ref.get("value") for ref in dict_refs}
+    heisig = refs.get("heisig")
+    heisig6 = refs.get("heisig6")
 
     return {
         "kanji": literal,
@@ -154,9 +135,18 @@ def process_character(char: Dict) -> Optional[Dict]:
 
 
 def find_example_words(
-    kanji: str, words_data: List[Dict], tags: Dict[str, str], max_examples: int = 3
+    kanji: str,
+    words_data: List[Dict],
+    tags: Dict[str, str],
+    max_examples: int = 3,
+    cache: Optional[Dict[str, Optional[Dict]]] = None,
 ) -> List[Dict]:
-    """Find example words containing this kanji"""
+    """
+    Find example words containing this kanji
+
+    If cache is given, processed words are memoized in it by JMdict entry id,
+    so words shared by several kanji (e.g. 学校 for 学 and 校) are processed once.
+    """
     examples = []
 
     for word in words_data:
@@ -164,7 +154,13 @@ def find_example_words(
         for k in kanji_forms:
             text = k.get("text", "")
             if kanji in text:
-                result = process_word(word, tags, include_examples=False)
+                word_id = word.get("id") if cache is not None else None
+                if word_id is not None and word_id in cache:
+                    result = cache[word_id]
+                else:
+                    result = process_word(word, tags, include_examples=False)
+                    if word_id is not None:
+                        cache[word_id] = result
                 if result and result.get("word"):
                     examples.append(result)
                     if len(examples) >= max_examples:
@@ -174,39 +170,86 @@ def find_example_words(
     return examples
 
 
+# Processed-character fields read by format_back_field, in unpacking order
+_BACK_KEYS = (
+    "meanings",
+    "on_readings",
+    "kun_readings",
+    "stroke_count",
+    "radical",
+    "frequency",
+    "grade",
+    "heisig_rtk",
+    "heisig6_rtk",
+    "nanori",
+    "tier",
+)
+
+
 def format_back_field(
     char: Dict, jlpt_level: str, example_words: Optional[List[Dict]] = None
 ) -> str:
     """Create formatted back field with styled HTML"""
+    # Fetch every field in one pass; missing keys come back as None
+    (
+        meanings,
+        on_readings,
+        kun_readings,
+        stroke_count,
+        radical,
+        frequency,
+        grade,
+        heisig_rtk,
+        heisig6_rtk,
+        nanori,
+        tier,
+    ) = map(char.get, _BACK_KEYS)
     return create_kanji_card(
         kanji=char["kanji"],
-        meanings=char.get("meanings", ""),
-        on_readings=char.get("on_readings", ""),
-        kun_readings=char.get("kun_readings", ""),
-        stroke_count=char.get("stroke_count"),
-        radical=char.get("radical"),
-        frequency=char.get("frequency"),
-        grade=char.get("grade"),
-        heisig_rtk=char.get("heisig_rtk") or None,
-        heisig6_rtk=char.get("heisig6_rtk") or None,
-        nanori=char.get("nanori") or None,
+        meanings=meanings or "",
+        on_readings=on_readings or "",
+        kun_readings=kun_readings or "",
+        stroke_count=stroke_count,
+        radical=radical,
+        frequency=frequency,
+        grade=grade,
+        heisig_rtk=heisig_rtk or None,
+        heisig6_rtk=heisig6_rtk or None,
+        nanori=nanori or None,
         example_words=example_words,
         jlpt_level=jlpt_level,
-        tier=char.get("tier"),
+        tier=tier,
     )
 
 
+@functools.cache
+def _tag_string(jlpt_tier: str, grade: Optional[int], tier: Optional[int]) -> str:
+    """Build the space-separated tags for a card (few distinct combinations)"""
+    tags_list = [jlpt_tier]
+    if grade:
+        tags_list.append(f"grade{grade}")
+    if tier:
+        tags_list.append(f"freq_tier{tier}")
+    return " ".join(tags_list)
+
+
 def create_anki_csv(
     characters: List[Dict],
     output_path: Path,
     jlpt_tier: str,
     example_words_map: Optional[Dict[str, List[Dict]]] = None,
+    apkg: bool = False,
 ) -> None:
-    """Create Anki-compatible CSV file with styled HTML front"""
+    """
+    Create Anki-compatible CSV file with styled HTML front
+
+    With apkg=True, write an Anki package (.apkg) next to output_path instead.
+    """
     fieldnames = ["kanji", "back", "tags"]
 
-    output_rows = []
-    for char in characters:
+    # One row per character, so size the list up front
+    output_rows: List[Optional[Tuple[str, str, str]]] = [None] * len(characters)
+    for i, char in enumerate(characters):
         # Create styled front field
         front = create_kanji_front(
             kanji=char["kanji"],
@@ -218,38 +261,20 @@ def create_anki_csv(
         )
         back = format_back_field(char, jlpt_tier, example_words)
 
-        # Tags
-        tags_list = [jlpt_tier]
-        if char.get("grade"):
-            tags_list.append(f"grade{char['grade']}")
-        if char.get("tier"):
-            tags_list.append(f"freq_tier{char['tier']}")
+        tags = _tag_string(jlpt_tier, char.get("grade"), char.get("tier"))
+        output_rows[i] = (front, back, tags)
 
-        row = {"kanji": front, "back": back, "tags": " ".join(tags_list)}
-        output_rows.append(row)
-
-    with open(output_path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(output_rows)
+    if apkg:
+        output_path = output_path.with_suffix(".apkg")
+        write_apkg(output_path, f"JLPT {jlpt_tier} Kanji", output_rows)
+    else:
+        write_csv(output_path, fieldnames, output_rows)
 
     print(f"Created: {output_path} ({len(characters)} cards)")
 
 
-def parse_args() -> argparse.Namespace:
-    """Parse command line arguments"""
-    parser = argparse.ArgumentParser(
-        description="Generate JLPT kanji Anki decks from Kanjidic2",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  %(prog)s                           # Use default input file
-  %(prog)s -i path/to/kanjidic.json  # Custom input file
-  %(prog)s -o my_decks/              # Custom output directory
-  %(prog)s --jmdict path/to/jmdict.json  # Include word examples
-        """,
-    )
-
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add kanji deck options to a parser (shared with make_decks.py)"""
     parser.add_argument(
         "-i",
         "--input",
@@ -280,17 +305,46 @@ Examples:
         help="Output directory (default: anki_decks/)",
     )
 
-    return parser.parse_args()
+    parser.add_argument(
+        "--apkg",
+        action="store_true",
+        help="Write Anki packages (.apkg) instead of CSV files (requires genanki)",
+    )
 
 
-def main():
-    args = parse_args()
+# Built once at import; parse_args only parses
+_PARSER = argparse.ArgumentParser(
+    description="Generate JLPT kanji Anki decks from Kanjidic2",
+    formatter_class=argparse.RawDescriptionHelpFormatter,
+    epilog="""
+Examples:
+  %(prog)s                           # Use default input file
+  %(prog)s -i path/to/kanjidic.json  # Custom input file
+  %(prog)s -o my_decks/              # Custom output directory
+  %(prog)s --jmdict path/to/jmdict.json  # Include word examples
+  %(prog)s --apkg                    # Write .apkg packages (needs genanki)
+        """,
+)
+add_arguments(_PARSER)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments"""
+    return _PARSER.parse_args()
+
+
+def main(args: Optional[argparse.Namespace] = None):
+    if args is None:
+        args = parse_args()
 
     input_file = args.input
-    output_dir = args.output_dir
     jmdict_file = args.jmdict
     max_examples = args.max_examples
 
+    # Fail before the slow loading steps rather than once per deck
+    if args.apkg:
+        require_genanki()
+
     if not input_file.exists():
         print(f"Error: {input_file} not found!", file=sys.stderr)
         print("Please download kanjidic2-en-3.6.2.json from:", file=sys.stderr)
@@ -310,6 +364,44 @@ def main():
         )
         sys.exit(1)
 
+    # Load JMdict for word examples if provided
+    jmdict_data: Optional[Dict] = None
+    if jmdict_file:
+        if not jmdict_file.exists():
+            print(f"Warning: JMdict file not found: {jmdict_file}", file=sys.stderr)
+            print("Continuing without word examples...", file=sys.stderr)
+        else:
+            print(
+                f"\nLoading JMdict for word examples (up to {max_examples} per kanji)..."
+            )
+            jmdict_data = load_json(jmdict_file)
+
+    generate_kanji_decks(
+        data,
+        args.output_dir,
+        jmdict_data=jmdict_data,
+        max_examples=max_examples,
+        apkg=args.apkg,
+        release_input=True,
+    )
+
+
+def generate_kanji_decks(
+    data: Dict,
+    output_dir: Path,
+    jmdict_data: Optional[Dict] = None,
+    max_examples: int = 3,
+    apkg: bool = False,
+    release_input: bool = False,
+) -> None:
+    """
+    Build kanji decks from parsed Kanjidic2 data and write them to output_dir.
+
+    jmdict_data, if given, supplies example words for each kanji. With
+    release_input, the Kanjidic2 "characters" list is emptied while
+    processing so raw entries can be freed early; data is left untouched
+    otherwise.
+    """
     # Calculate frequency tiers for all kanji with frequency data
     print("Calculating frequency tiers...")
     kanji_freq_map = build_kanji_frequency_map(data)
@@ -330,31 +422,52 @@ def main():
     processed = 0
     skipped = 0
 
-    for char in data.get("characters", []):
+    # Dispatch table for old JLPT levels with a fixed new level;
+    # level 2 is split between N3 and N2 by grade below
+    appenders = {
+        old_level: jlpt_groups[new_level].append
+        for old_level, new_level in OLD_TO_NEW_JLPT.items()
+    }
+    appender_get = appenders.get
+    append_n3 = jlpt_groups["N3"].append
+    append_n2 = jlpt_groups["N2"].append
+    tier_get = kanji_tier_map.get
+
+    # Most of Kanjidic has no JLPT level; drop those entries before processing
+    characters = data.get("characters", [])
+    jlpt_characters = [
+        char
+        for char in characters
+        if char.get("misc", EMPTY_DICT).get("jlptLevel") is not None
+    ]
+    skipped += len(characters) - len(jlpt_characters)
+    entries: Iterable[Dict] = jlpt_characters
+    if release_input:
+        characters.clear()
+        entries = consume(jlpt_characters)
+
+    for char in entries:
         result = process_character(char)
         if result:
             # Add tier information
-            kanji = result["kanji"]
-            if kanji in kanji_tier_map:
-                result["tier"] = kanji_tier_map[kanji]
+            tier = tier_get(result["kanji"])
+            if tier is not None:
+                result["tier"] = tier
 
             level = result["jlpt_level"]
-            if level == 4:
-                jlpt_groups["N5"].append(result)
-            elif level == 3:
-                jlpt_groups["N4"].append(result)
-            elif level == 2:
+            if level == 2:
                 # Split level 2 between N3 and N2 based on grade
                 grade = result.get("grade")
                 if grade and grade <= 6:
-                    jlpt_groups["N3"].append(result)
+                    append_n3(result)
                 else:
-                    jlpt_groups["N2"].append(result)
-            elif level == 1:
-                jlpt_groups["N1"].append(result)
+                    append_n2(result)
             else:
-                skipped += 1  # Unknown JLPT level
-                continue
+                append = appender_get(level)
+                if append is None:
+                    skipped += 1  # Unknown JLPT level
+                    continue
+                append(result)
             processed += 1
         else:
             skipped += 1
@@ -363,35 +476,31 @@ def main():
     if skipped > 0:
         print(f"Skipped {skipped} entries (no JLPT level or invalid data)")
 
-    # Load JMdict for word examples if provided
+    # Build example words map for all kanji
     example_words_map: Optional[Dict[str, List[Dict]]] = None
-    if jmdict_file:
-        if not jmdict_file.exists():
-            print(f"Warning: JMdict file not found: {jmdict_file}", file=sys.stderr)
-            print("Continuing without word examples...", file=sys.stderr)
-        else:
-            print(
-                f"\nLoading JMdict for word examples (up to {max_examples} per kanji)..."
-            )
-            jmdict_data = load_json(jmdict_file)
-            tags = jmdict_data.get("tags", {})
-            words = jmdict_data.get("words", [])
-            print(f"Loaded {len(words)} words")
-
-            # Build example words map for all kanji
-            print("Finding example words for each kanji...")
-            example_words_map = {}
-            for level in ["N5", "N4", "N3", "N2", "N1"]:
-                for char in jlpt_groups[level]:
-                    kanji = char["kanji"]
-                    examples = find_example_words(
-                        kanji, words, tags, max_examples=max_examples
-                    )
-                    example_words_map[kanji] = examples
-            print(f"Found examples for {len(example_words_map)} kanji")
+    if jmdict_data is not None:
+        tags = jmdict_data.get("tags", {})
+        words = jmdict_data.get("words", [])
+        print(f"Loaded {len(words)} words")
+
+        print("Finding example words for each kanji...")
+        example_words_map = {}
+        processed_words: Dict[str, Optional[Dict]] = {}
+        for level in ["N5", "N4", "N3", "N2", "N1"]:
+            for char in jlpt_groups[level]:
+                kanji = char["kanji"]
+                examples = find_example_words(
+                    kanji,
+                    words,
+                    tags,
+                    max_examples=max_examples,
+                    cache=processed_words,
+                )
+                example_words_map[kanji] = examples
+        print(f"Found examples for {len(example_words_map)} kanji")
 
     # Create output directory
-    output_dir.mkdir(exist_ok=True)
+    output_dir.mkdir(parents=True, exist_ok=True)
 
     # Generate CSV files
     print(f"\nGenerating CSV files in {output_dir}...")
@@ -399,7 +508,7 @@ def main():
         characters = jlpt_groups[tier]
         if characters:
             output_path = output_dir / f"jlpt_{tier}_kanji.csv"
-            create_anki_csv(characters, output_path, tier, example_words_map)
+            create_anki_csv(characters, output_path, tier, example_words_map, apkg=apkg)
 
     # Summary
     print("\n" + "=" * 60)
@@ -414,6 +523,10 @@ def main():
     print("\n" + "=" * 60)
     print("IMPORT INSTRUCTIONS")
     print("=" * 60)
+    if apkg:
+        print("Open Anki → File → Import and select each .apkg file")
+        return
+
     print("1. Open Anki")
     print("2. File → Import")
     print("3. Select CSV file")
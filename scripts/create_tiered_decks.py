@@ -23,19 +23,23 @@ Usage:
 """
 
 import argparse
-import csv
+import re
 import sys
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 from jmdict_utils import (
+    EMPTY_DICT,
+    OLD_TO_NEW_JLPT,
+    consume,
     load_json,
     build_kanji_jlpt_map,
     build_kanji_frequency_map,
     calculate_frequency_tiers,
-    get_word_jlpt_level,
-    get_word_frequency_tier,
+    classify_word,
+    extract_reading_meaning,
     process_word,
+    write_csv,
 )
 from card_templates import (
     create_kanji_card,
@@ -51,9 +55,9 @@ def process_kanji_character(char: Dict) -> Optional[Dict]:
     if not literal:
         return None
 
-    misc = char.get("misc", {})
+    misc = char.get("misc", EMPTY_DICT)
     reading_meaning = char.get("readingMeaning")
-    dict_refs = char.get("dictionaryReferences", [])
+    dict_refs = char.get("dictionaryReferences", ())
 
     # JLPT level (1-4, old system)
     jlpt_level = misc.get("jlptLevel")
@@ -63,7 +67,7 @@ def process_kanji_character(char: Dict) -> Optional[Dict]:
         return None
 
     # Stroke count
-    stroke_counts = misc.get("strokeCounts", [])
+    stroke_counts = misc.get("strokeCounts", ())
     stroke_count = stroke_counts[0] if stroke_counts else None
 
     # Grade
@@ -72,31 +76,11 @@ def process_kanji_character(char: Dict) -> Optional[Dict]:
     # Frequency rank
     frequency = misc.get("frequency")
 
-    # Extract readings
-    on_readings = []
-    kun_readings = []
-    if reading_meaning and "groups" in reading_meaning:
-        for group in reading_meaning.get("groups", []):
-            for reading in group.get("readings", []):
-                rtype = reading.get("type", "")
-                value = reading.get("value", "")
-                if rtype == "ja_on":
-                    on_readings.append(value)
-                elif rtype == "ja_kun":
-                    kun_readings.append(value)
-
-    # Extract meanings
-    meanings = []
-    if reading_meaning and "groups" in reading_meaning:
-        for group in reading_meaning.get("groups", []):
-            for meaning in group.get("meanings", []):
-                if meaning.get("lang", "en") == "en":
-                    value = meaning.get("value")
-                    if value:
-                        meanings.append(value)
+    # Readings and meanings in a single pass over the groups
+    on_readings, kun_readings, meanings = extract_reading_meaning(reading_meaning)
 
     # Get radical
-    radicals = char.get("radicals", [])
+    radicals = char.get("radicals", ())
     radical = None
     if radicals and len(radicals) > 0:
         radical = radicals[0].get("value")
@@ -105,13 +89,9 @@ def process_kanji_character(char: Dict) -> Optional[Dict]:
     nanori = reading_meaning.get("nanori", []) if reading_meaning else []
 
     # Extract Heisig RTK references
-    heisig = None
-    heisig6 = None
-    for ref in dict_refs:
-        if ref.get("type") == "heisig":
-            heisig = ref.get("value")
-        elif ref.get("type") == "heisig6":
-            heisig6 = ref.get("value")
+    refs = {ref.get("type"): ref.get("value") for ref in dict_refs}
+    heisig = refs.get("heisig")
+    heisig6 = refs.get("heisig6")
 
     return {
         "kanji": literal,
@@ -129,6 +109,10 @@ def process_kanji_character(char: Dict) -> Optional[Dict]:
     }
 
 
+# Kanji characters (CJK Unified Ideographs)
+_KANJI_RE = re.compile("[\u4e00-\u9fff]")
+
+
 def build_kanji_examples_map(
     vocab_groups: Dict[str, Dict[int, List[Dict]]], max_examples: int = 3
 ) -> Dict[str, List[Dict]]:
@@ -152,26 +136,24 @@ def build_kanji_examples_map(
                 word_text = word.get("word", "")
                 word_tier = word.get("tier", 999)  # Default to high tier if not set
 
-                # Check each character in the word
-                for char in word_text:
-                    # Only process kanji characters (CJK Unified Ideographs)
-                    if "\u4e00" <= char <= "\u9fff":
-                        if char not in kanji_all_words:
-                            kanji_all_words[char] = []
-
-                        # Skip if the word is exactly the kanji character itself
-                        if word_text == char:
-                            continue
-
-                        # Add word with tier info if not already added for this kanji
-                        if not any(
-                            w.get("word") == word.get("word")
-                            for w in kanji_all_words[char]
-                        ):
-                            # Store word with tier for sorting
-                            word_with_tier = dict(word)
-                            word_with_tier["_sort_tier"] = word_tier
-                            kanji_all_words[char].append(word_with_tier)
+                # Check each kanji character in the word; the regex drops kana
+                # and punctuation in C instead of range-checking every char
+                for char in _KANJI_RE.findall(word_text):
+                    if char not in kanji_all_words:
+                        kanji_all_words[char] = []
+
+                    # Skip if the word is exactly the kanji character itself
+                    if word_text == char:
+                        continue
+
+                    # Add word with tier info if not already added for this kanji
+                    if not any(
+                        w.get("word") == word.get("word") for w in kanji_all_words[char]
+                    ):
+                        # Store word with tier for sorting
+                        word_with_tier = dict(word)
+                        word_with_tier["_sort_tier"] = word_tier
+                        kanji_all_words[char].append(word_with_tier)
 
     # Second pass: sort by tier (frequency) and take top max_examples
     kanji_examples: Dict[str, List[Dict]] = {}
@@ -209,21 +191,22 @@ def format_kanji_back_field(
     char: Dict, jlpt_level: str, example_words: Optional[List[Dict]] = None
 ) -> str:
     """Create formatted back field with styled HTML"""
+    get = char.get
     return create_kanji_card(
         kanji=char["kanji"],
-        meanings=char.get("meanings", ""),
-        on_readings=char.get("on_readings", ""),
-        kun_readings=char.get("kun_readings", ""),
-        stroke_count=char.get("stroke_count"),
-        radical=char.get("radical"),
-        frequency=char.get("frequency"),
-        grade=char.get("grade"),
-        heisig_rtk=char.get("heisig_rtk") or None,
-        heisig6_rtk=char.get("heisig6_rtk") or None,
-        nanori=char.get("nanori") or None,
+        meanings=get("meanings", ""),
+        on_readings=get("on_readings", ""),
+        kun_readings=get("kun_readings", ""),
+        stroke_count=get("stroke_count"),
+        radical=get("radical"),
+        frequency=get("frequency"),
+        grade=get("grade"),
+        heisig_rtk=get("heisig_rtk") or None,
+        heisig6_rtk=get("heisig6_rtk") or None,
+        nanori=get("nanori") or None,
         example_words=example_words,
         jlpt_level=jlpt_level,
-        tier=char.get("tier"),
+        tier=get("tier"),
     )
 
 
@@ -257,13 +240,9 @@ def create_kanji_csv(
         if char.get("tier"):
             tags_list.append(f"freq_tier{char['tier']}")
 
-        row = {"kanji": front, "back": back, "tags": " ".join(tags_list)}
-        output_rows.append(row)
+        output_rows.append((front, back, " ".join(tags_list)))
 
-    with open(output_path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(output_rows)
+    write_csv(output_path, fieldnames, output_rows)
 
     print(f"    Created: {output_path} ({len(characters)} kanji)")
 
@@ -306,33 +285,19 @@ def create_vocab_csv(
         if word.get("tier"):
             tags_list.append(f"freq_tier{word['tier']}")
 
-        row = {"word": front, "back": back, "tags": " ".join(tags_list)}
-        output_rows.append(row)
+        output_rows.append((front, back, " ".join(tags_list)))
 
-    with open(output_path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(output_rows)
+    write_csv(output_path, fieldnames, output_rows)
 
     print(f"    Created: {output_path} ({len(words)} words)")
 
 
 def get_new_jlpt_level(old_level: int, grade: Optional[int]) -> str:
     """Convert old JLPT level to new N-level system"""
-    if old_level == 4:
-        return "N5"
-    elif old_level == 3:
-        return "N4"
-    elif old_level == 2:
+    if old_level == 2:
         # Split level 2 between N3 and N2 based on grade
-        if grade and grade <= 6:
-            return "N3"
-        else:
-            return "N2"
-    elif old_level == 1:
-        return "N1"
-    else:
-        return "unknown"
+        return "N3" if grade and grade <= 6 else "N2"
+    return OLD_TO_NEW_JLPT.get(old_level, "unknown")
 
 
 def parse_args() -> argparse.Namespace:
@@ -460,7 +425,7 @@ def main():
     kanji_processed = 0
     kanji_skipped = 0
 
-    for char in kanjidic_data.get("characters", []):
+    for char in consume(kanjidic_data.get("characters", [])):
         result = process_kanji_character(char)
         if result:
             # Add tier information
@@ -489,6 +454,8 @@ def main():
     )
     jmdict_data = load_json(jmdict_file)
     tags = jmdict_data.get("tags", {})
+    # Tag labels are cached per run, alongside the tags dict they come from
+    label_memo: Dict[Tuple[str, ...], str] = {}
     total_entries = len(jmdict_data.get("words", []))
     print(f"Total entries: {total_entries}")
 
@@ -505,26 +472,27 @@ def main():
     vocab_processed = 0
     vocab_skipped = 0
 
-    for word in jmdict_data.get("words", []):
-        result = process_word(word, tags, include_examples=include_examples)
+    # Raw entries are released as they are processed to cap peak memory
+    for word in consume(jmdict_data.get("words", [])):
+        result = process_word(
+            word, tags, include_examples=include_examples, label_memo=label_memo
+        )
         if result:
             # Filter by common-only if requested
             if args.common_only and not result["is_common"]:
                 vocab_skipped += 1
                 continue
 
-            jlpt_level = get_word_jlpt_level(word, kanji_jlpt_map)
+            # JLPT level and frequency tier from one scan of the word's kanji
+            jlpt_level, tier = classify_word(
+                word, kanji_jlpt_map, kanji_tier_map, strategy=args.tier_strategy
+            )
 
             # Skip kana-only and non-JLPT words for tiered decks
             if jlpt_level not in ["N5", "N4", "N3", "N2", "N1"]:
                 vocab_skipped += 1
                 continue
 
-            # Calculate frequency tier for the word
-            tier = get_word_frequency_tier(
-                word, kanji_tier_map, strategy=args.tier_strategy
-            )
-
             if tier:
                 result["tier"] = tier
                 jlpt_vocab_groups[jlpt_level][tier].append(result)
@@ -10,19 +10,18 @@ Usage:
 """
 
 import argparse
-import csv
 import sys
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from jmdict_utils import (
     load_json,
     build_kanji_jlpt_map,
     build_kanji_frequency_map,
     calculate_frequency_tiers,
-    get_word_jlpt_level,
-    get_word_frequency_tier,
-    process_word,
+    classify_word,
+    process_words,
+    write_csv,
 )
 from card_templates import create_vocab_card, create_vocab_front
 
@@ -34,6 +33,7 @@ def create_vocab_csv(
     fieldnames = ["word", "back", "tags"]
 
     output_rows = []
+    rows_append = output_rows.append
     for word in words:
         # Create styled front field
         front = create_vocab_front(
@@ -62,31 +62,23 @@ def create_vocab_csv(
         if word.get("tier"):
             tags_list.append(f"freq_tier{word['tier']}")
 
-        row = {"word": front, "back": back, "tags": " ".join(tags_list)}
-        output_rows.append(row)
+        rows_append((front, back, " ".join(tags_list)))
 
-    with open(output_path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(output_rows)
+    write_csv(output_path, fieldnames, output_rows)
 
     print(f"Created: {output_path} ({len(words)} cards)")
 
 
-def parse_args() -> argparse.Namespace:
-    """Parse command line arguments"""
-    parser = argparse.ArgumentParser(
-        description="Generate JLPT vocabulary Anki decks from JMdict",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  %(prog)s                           # Generate decks without examples
-  %(prog)s --examples                # Include example sentences
-  %(prog)s -e --output-dir decks/    # Custom output directory
-  %(prog)s --jmdict path/to/jmdict.json --kanjidic path/to/kanjidic.json
-        """,
-    )
+def positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
 
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add vocabulary deck options to a parser (shared with make_decks.py)"""
     parser.add_argument(
         "-e",
         "--examples",
@@ -140,11 +132,36 @@ Examples:
         ),
     )
 
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=positive_int,
+        default=None,
+        help="Number of worker processes for word processing (default: CPU count; 1 disables)",
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(
+        description="Generate JLPT vocabulary Anki decks from JMdict",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s                           # Generate decks without examples
+  %(prog)s --examples                # Include example sentences
+  %(prog)s -e --output-dir decks/    # Custom output directory
+  %(prog)s --jmdict path/to/jmdict.json --kanjidic path/to/kanjidic.json
+        """,
+    )
+
+    add_arguments(parser)
     return parser.parse_args()
 
 
-def main():
-    args = parse_args()
+def main(args: Optional[argparse.Namespace] = None):
+    if args is None:
+        args = parse_args()
 
     # Determine which JMdict file to use
     if args.examples:
@@ -178,6 +195,27 @@ def main():
 
     print("Loading Kanjidic2 (kanji JLPT and frequency data)...")
     kanjidic_data = load_json(kanjidic_file)
+    kanji_jlpt_map, kanji_tier_map = build_kanji_maps(kanjidic_data)
+
+    print(
+        f"\nLoading JMdict ({'with examples' if args.examples else 'without examples'})..."
+    )
+    jmdict_data = load_json(jmdict_file)
+
+    generate_vocab_decks(
+        jmdict_data,
+        kanji_jlpt_map,
+        kanji_tier_map,
+        output_dir,
+        include_examples=args.examples,
+        common_only=args.common_only,
+        tier_strategy=args.tier_strategy,
+        workers=args.workers,
+    )
+
+
+def build_kanji_maps(kanjidic_data: Dict) -> Tuple[Dict[str, str], Dict[str, int]]:
+    """Build the kanji -> JLPT level and kanji -> frequency tier maps"""
     kanji_jlpt_map = build_kanji_jlpt_map(kanjidic_data)
     print(f"Loaded {len(kanji_jlpt_map)} kanji with JLPT levels")
 
@@ -187,26 +225,26 @@ def main():
     kanji_tier_map = calculate_frequency_tiers(kanji_freq_map)
     print(f"Calculated tiers for {len(kanji_tier_map)} kanji with frequency data")
 
-    print(
-        f"\nLoading JMdict ({'with examples' if args.examples else 'without examples'})..."
-    )
-    jmdict_data = load_json(jmdict_file)
+    return kanji_jlpt_map, kanji_tier_map
+
+
+def generate_vocab_decks(
+    jmdict_data: Dict,
+    kanji_jlpt_map: Dict[str, str],
+    kanji_tier_map: Dict[str, int],
+    output_dir: Path,
+    include_examples: bool = False,
+    common_only: bool = False,
+    tier_strategy: str = "conservative",
+    workers: Optional[int] = None,
+) -> None:
+    """
+    Build vocabulary decks from parsed JMdict data and write them to output_dir.
+    """
     tags = jmdict_data.get("tags", {})
     total_entries = len(jmdict_data.get("words", []))
     print(f"Total entries: {total_entries}")
 
-    # Count entries with examples if applicable
-    if args.examples:
-        words_with_examples = sum(
-            1
-            for word in jmdict_data.get("words", [])
-            if any(
-                sense.get("examples") and len(sense["examples"]) > 0
-                for sense in word.get("sense", [])
-            )
-        )
-        print(f"Entries with examples: {words_with_examples}")
-
     # Categorize words by JLPT level
     print("\nCategorizing words by JLPT level...")
     jlpt_groups: Dict[str, List] = {
@@ -221,65 +259,84 @@ def main():
 
     processed = 0
     skipped = 0
+    words_with_examples = 0
+
+    # Bind hot-loop lookups to locals
+    appenders = {level: group.append for level, group in jlpt_groups.items()}
+
+    # Entries are independent, so the heavy formatting runs across processes
+    words = jmdict_data.get("words", [])
+    results = process_words(
+        words, tags, include_examples=include_examples, workers=workers
+    )
+
+    for word, result in zip(words, results):
+        # Count entries with examples if applicable
+        if include_examples and any(
+            sense.get("examples") for sense in word.get("sense", [])
+        ):
+            words_with_examples += 1
 
-    for word in jmdict_data.get("words", []):
-        result = process_word(word, tags, include_examples=args.examples)
         if result:
             # Filter by common-only if requested
-            if args.common_only and not result["is_common"]:
+            if common_only and not result["is_common"]:
                 skipped += 1
                 continue
 
-            jlpt_level = get_word_jlpt_level(word, kanji_jlpt_map)
-
-            # Calculate frequency tier for the word
-            tier = get_word_frequency_tier(
-                word, kanji_tier_map, strategy=args.tier_strategy
+            # JLPT level and frequency tier from one scan of the word's kanji
+            jlpt_level, tier = classify_word(
+                word, kanji_jlpt_map, kanji_tier_map, strategy=tier_strategy
             )
             if tier:
                 result["tier"] = tier
 
-            jlpt_groups[jlpt_level].append(result)
+            appenders[jlpt_level](result)
             processed += 1
         else:
             skipped += 1
 
+    if include_examples:
+        print(f"Entries with examples: {words_with_examples}")
     print(f"Processed: {processed} words")
-    if args.common_only:
+    if common_only:
         print(f"Skipped (not common): {skipped} words")
 
     # Create output directory
-    output_dir.mkdir(exist_ok=True)
+    output_dir.mkdir(parents=True, exist_ok=True)
 
     print(f"\nGenerating CSV files in {output_dir}...")
 
     # Generate CSV files for each JLPT level
     for tier in ["N5", "N4", "N3", "N2", "N1"]:
-        words = jlpt_groups[tier]
-        if words:
-            suffix = "_examples" if args.examples else ""
+        if jlpt_groups[tier]:
+            suffix = "_examples" if include_examples else ""
             output_path = output_dir / f"jlpt_{tier}_vocab{suffix}.csv"
-            create_vocab_csv(words, output_path, tier, include_examples=args.examples)
+            create_vocab_csv(
+                jlpt_groups[tier],
+                output_path,
+                tier,
+                include_examples=include_examples,
+            )
 
     # Also create files for kana-only and non-JLPT words
     if jlpt_groups["kana_only"]:
-        suffix = "_examples" if args.examples else ""
+        suffix = "_examples" if include_examples else ""
         output_path = output_dir / f"jlpt_kana_only_vocab{suffix}.csv"
         create_vocab_csv(
             jlpt_groups["kana_only"],
             output_path,
             "kana",
-            include_examples=args.examples,
+            include_examples=include_examples,
         )
 
     if jlpt_groups["non_jlpt"]:
-        suffix = "_examples" if args.examples else ""
+        suffix = "_examples" if include_examples else ""
         output_path = output_dir / f"jlpt_non_jlpt_vocab{suffix}.csv"
         create_vocab_csv(
             jlpt_groups["non_jlpt"],
             output_path,
             "non_jlpt",
-            include_examples=args.examples,
+            include_examples=include_examples,
         )
 
     # Summary
@@ -299,7 +356,7 @@ def main():
     print("\n" + "=" * 60)
     print("FREQUENCY TIER INFORMATION")
     print("=" * 60)
-    print(f"Tier strategy: {args.tier_strategy}")
+    print(f"Tier strategy: {tier_strategy}")
     print("Tier 1: Top 25% most frequent kanji")
     print("Tier 2: 25-50%")
     print("Tier 3: 50-75%")
@@ -320,7 +377,7 @@ def main():
     print("\nNote: A word is assigned to the HIGHEST (most difficult)")
     print("JLPT level of any kanji it contains.")
 
-    if args.examples:
+    if include_examples:
         print("\nExamples are from Tatoeba corpus (Japanese/English pairs)")
 
 
@@ -3,18 +3,40 @@
 Shared utilities for JMdict/Anki deck generation scripts
 """
 
+import csv
+import io
 import json
 import math
+import os
 import sys
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, FrozenSet, Iterator, List, Optional, Tuple, Any
+
+try:
+    # orjson parses large dictionary files several times faster than stdlib json
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# Below this many entries the cost of starting worker processes outweighs
+# the time saved by processing words in parallel
+PARALLEL_MIN_WORDS = 2000
+
+# Fixed note type id for .apkg output, so re-imported decks reuse one note type
+APKG_MODEL_ID = 1607392319
+
+# Shared default for missing sub-dicts; only ever read, never mutated
+EMPTY_DICT: Dict = {}
 
 
 def load_json(filepath: Path) -> Dict:
     """Load and parse JSON file with error handling"""
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(filepath, "rb") as f:
+            return json_loads(f.read())
     except FileNotFoundError:
         print(f"Error: File not found: {filepath}", file=sys.stderr)
         sys.exit(1)
@@ -26,6 +48,94 @@ def load_json(filepath: Path) -> Dict:
         sys.exit(1)
 
 
+def write_csv(output_path: Path, fieldnames: List[str], rows: List[Tuple]) -> None:
+    """
+    Write a header and rows as CSV in a single file write.
+
+    Rows are escaped by csv.writer into an in-memory buffer first, then the
+    whole text is UTF-8 encoded once and written in binary mode, so the file
+    sees one write call instead of one per row.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fieldnames)
+    writer.writerows(rows)
+
+    with open(output_path, "wb") as f:
+        f.write(buffer.getvalue().encode("utf-8"))
+
+
+def require_genanki() -> Any:
+    """Import the optional genanki package, exiting with a hint if missing"""
+    try:
+        import genanki
+    except ImportError:
+        print(
+            "Error: .apkg output requires genanki (pip install genanki)",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+    return genanki
+
+
+def write_apkg(output_path: Path, deck_name: str, rows: List[Tuple]) -> None:
+    """
+    Write (front, back, tags) rows as an Anki package via the optional genanki.
+
+    The note type mirrors Anki's "Basic" (Front/Back), matching how the CSV
+    files are meant to be imported.
+    """
+    genanki = require_genanki()
+
+    model = genanki.Model(
+        APKG_MODEL_ID,
+        "JLPT Basic",
+        fields=[{"name": "Front"}, {"name": "Back"}],
+        templates=[
+            {
+                "name": "Card 1",
+                "qfmt": "{{Front}}",
+                "afmt": '{{FrontSide}}<hr id="answer">{{Back}}',
+            }
+        ],
+    )
+    # Deck id and note guids are derived from the deck name and card front,
+    # so re-importing a regenerated deck updates its notes in place
+    deck = genanki.Deck(zlib.crc32(deck_name.encode("utf-8")), deck_name)
+    for front, back, tags in rows:
+        deck.add_note(
+            genanki.Note(
+                model=model,
+                fields=[front, back],
+                tags=tags.split(),
+                guid=genanki.guid_for(front),
+            )
+        )
+
+    genanki.Package(deck).write_to_file(str(output_path))
+
+
+def consume(items: List) -> Iterator:
+    """
+    Yield list items in order, dropping each from the list as it is handed out.
+
+    Lets callers walk a large parsed array (e.g. JMdict "words") so that each
+    raw entry can be garbage-collected once processed, instead of keeping the
+    whole document alive until the loop finishes. The list is empty afterwards.
+    """
+    items.reverse()
+    while items:
+        yield items.pop()
+
+
+# Old JLPT to new JLPT mapping:
+# Level 4 (easiest) -> N5
+# Level 3 -> N4
+# Level 2 -> N3/N2 (split by grade, handled by callers)
+# Level 1 (hardest) -> N1
+OLD_TO_NEW_JLPT = {4: "N5", 3: "N4", 1: "N1"}
+
+
 def build_kanji_jlpt_map(kanjidic_data: Dict) -> Dict[str, str]:
     """
     Build a map of kanji -> JLPT level
@@ -33,24 +143,12 @@ def build_kanji_jlpt_map(kanjidic_data: Dict) -> Dict[str, str]:
     """
     kanji_jlpt = {}
 
-    # Old JLPT to new JLPT mapping:
-    # Level 4 (easiest) -> N5
-    # Level 3 -> N4
-    # Level 2 -> N3/N2 (split by grade)
-    # Level 1 (hardest) -> N1
-    OLD_TO_NEW_JLPT = {
-        4: "N5",
-        3: "N4",
-        2: None,  # Special handling below
-        1: "N1",
-    }
-
     for char in kanjidic_data.get("characters", []):
         literal = char.get("literal")
         if not literal:
             continue
 
-        misc = char.get("misc", {})
+        misc = char.get("misc", EMPTY_DICT)
         jlpt_level = misc.get("jlptLevel")
 
         if jlpt_level is None:
@@ -63,8 +161,10 @@ def build_kanji_jlpt_map(kanjidic_data: Dict) -> Dict[str, str]:
                 kanji_jlpt[literal] = "N3"
             else:
                 kanji_jlpt[literal] = "N2"
-        elif jlpt_level in OLD_TO_NEW_JLPT:
-            kanji_jlpt[literal] = OLD_TO_NEW_JLPT[jlpt_level]
+        else:
+            new_level = OLD_TO_NEW_JLPT.get(jlpt_level)
+            if new_level:
+                kanji_jlpt[literal] = new_level
 
     return kanji_jlpt
 
@@ -81,7 +181,7 @@ def build_kanji_frequency_map(kanjidic_data: Dict) -> Dict[str, int]:
         if not literal:
             continue
 
-        misc = char.get("misc", {})
+        misc = char.get("misc", EMPTY_DICT)
         frequency = misc.get("frequency")
 
         if frequency is not None:
@@ -114,27 +214,49 @@ def calculate_frequency_tiers(kanji_freq_map: Dict[str, int]) -> Dict[str, int]:
         return {}
 
     # Sort kanji by frequency rank (ascending = most frequent first)
-    sorted_kanji = sorted(kanji_freq_map.items(), key=lambda x: x[1])
+    sorted_kanji = sorted(kanji_freq_map, key=kanji_freq_map.get)
     total = len(sorted_kanji)
 
     if total == 0:
         return {}
 
-    # Build tier map using percentile calculation for even distribution
-    kanji_tiers = {}
-    for i, (kanji, _) in enumerate(sorted_kanji):
-        # Calculate percentile (0-100) for this kanji
-        percentile = (i / total) * 100
-        if percentile < 25:
-            kanji_tiers[kanji] = 1  # Top 25% - most frequent
-        elif percentile < 50:
-            kanji_tiers[kanji] = 2  # 25-50%
-        elif percentile < 75:
-            kanji_tiers[kanji] = 3  # 50-75%
-        else:
-            kanji_tiers[kanji] = 4  # Bottom 25% - least frequent
+    # Build tier map using percentile calculation for even distribution:
+    # position i falls in quartile floor(4 * i / total), computed in integers
+    # (i / total * 100 < 25 * q  <=>  4 * i < q * total)
+    return {kanji: i * 4 // total + 1 for i, kanji in enumerate(sorted_kanji)}
+
+
+def extract_reading_meaning(
+    reading_meaning: Optional[Dict], lang: str = "en"
+) -> Tuple[List[str], List[str], List[str]]:
+    """Extract on'yomi, kun'yomi and meanings in a single pass over groups"""
+    on_readings: List[str] = []
+    kun_readings: List[str] = []
+    meanings: List[str] = []
 
-    return kanji_tiers
+    if not reading_meaning:
+        return on_readings, kun_readings, meanings
+
+    # Readings of other types (pinyin, korean, ...) land in a discarded list
+    buckets = {"ja_on": on_readings, "ja_kun": kun_readings}
+    discarded: List[str] = []
+
+    for group in reading_meaning.get("groups", ()):
+        for reading in group.get("readings", ()):
+            buckets.get(reading.get("type"), discarded).append(reading.get("value", ""))
+
+        for meaning in group.get("meanings", ()):
+            if meaning.get("lang", "en") == lang:
+                value = meaning.get("value")
+                if value:
+                    meanings.append(value)
+
+    return on_readings, kun_readings, meanings
+
+
+def _kanji_chars(kanji_forms: List[Dict]) -> FrozenSet[str]:
+    """Distinct characters across all kanji forms of a word"""
+    return frozenset("".join(k.get("text", "") for k in kanji_forms))
 
 
 def get_word_frequency_tier(
@@ -171,32 +293,53 @@ def get_word_frequency_tier(
         # Kana-only word - no tier
         return None
 
-    # Collect tiers for all kanji in the word
+    if strategy not in ("average", "first"):
+        # Conservative only needs the distinct kanji, so match them against
+        # the map with a set intersection instead of a per-character loop
+        chars = _kanji_chars(kanji_forms)
+        matches = chars.intersection(kanji_tier_map)
+        if not matches:
+            return None
+        return max(kanji_tier_map[char] for char in matches)
+
+    # Collect tiers for all kanji in the word, in order
     tiers_found = []
 
     for kanji_entry in kanji_forms:
         kanji_text = kanji_entry.get("text", "")
         for char in kanji_text:
-            # Only check characters that are actually kanji (CJK Unified Ideographs)
-            if "\u4e00" <= char <= "\u9fff" and char in kanji_tier_map:
+            # The map only holds kanji, so membership alone skips kana and
+            # punctuation; no separate CJK range check is needed
+            if char in kanji_tier_map:
                 tiers_found.append(kanji_tier_map[char])
 
     if not tiers_found:
         # No kanji with tier data found
         return None
 
-    if strategy == "conservative":
-        # Return highest tier (least frequent) - most conservative
-        return max(tiers_found)
-    elif strategy == "average":
+    if strategy == "average":
         # Return average tier rounded up
         return math.ceil(sum(tiers_found) / len(tiers_found))
-    elif strategy == "first":
+    else:
         # Return tier of first kanji only
         return tiers_found[0]
-    else:
-        # Default to conservative
-        return max(tiers_found)
+
+
+# Priority: N1 > N2 > N3 > N4 > N5
+_LEVEL_PRIORITY = {"N1": 5, "N2": 4, "N3": 3, "N4": 2, "N5": 1}
+
+
+def _level_priority(level: str) -> int:
+    """Sort key ranking JLPT levels by difficulty (unknown levels lowest)"""
+    return _LEVEL_PRIORITY.get(level, 0)
+
+
+def _hardest_level(levels: List[str]) -> str:
+    """Most difficult of the given JLPT levels"""
+    # N1 is the ceiling, so there is nothing to rank once it is present
+    if "N1" in levels:
+        return "N1"
+    return max(levels, key=_level_priority)
 
 
 def get_word_jlpt_level(word: Dict, kanji_jlpt_map: Dict[str, str]) -> str:
@@ -210,32 +353,50 @@ def get_word_jlpt_level(word: Dict, kanji_jlpt_map: Dict[str, str]) -> str:
         # Kana-only word
         return "kana_only"
 
-    # Check all kanji in all forms of the word
-    levels_found = []
-
-    for kanji_entry in kanji_forms:
-        kanji_text = kanji_entry.get("text", "")
-        for char in kanji_text:
-            # Only check characters that are actually kanji (CJK Unified Ideographs)
-            if "\u4e00" <= char <= "\u9fff" and char in kanji_jlpt_map:
-                levels_found.append(kanji_jlpt_map[char])
+    # Match the distinct characters of all forms against the map in one set
+    # operation; the map only holds kanji, so kana and punctuation drop out
+    chars = _kanji_chars(kanji_forms)
+    levels_found = [kanji_jlpt_map[char] for char in chars.intersection(kanji_jlpt_map)]
 
     if not levels_found:
         # No JLPT kanji found in this word
         return "non_jlpt"
 
     # Return the highest (most difficult) level
-    # Priority: N1 > N2 > N3 > N4 > N5
-    level_priority = {"N1": 5, "N2": 4, "N3": 3, "N4": 2, "N5": 1}
+    return _hardest_level(levels_found)
+
+
+def classify_word(
+    word: Dict,
+    kanji_jlpt_map: Dict[str, str],
+    kanji_tier_map: Dict[str, int],
+    strategy: str = "conservative",
+) -> Tuple[str, Optional[int]]:
+    """
+    Determine a word's JLPT level and frequency tier together.
+
+    Same results as get_word_jlpt_level and get_word_frequency_tier, but the
+    word's kanji characters are collected once and probed in both maps.
+
+    Returns:
+        (jlpt_level, tier) - tier is None if no tier data is available
+    """
+    kanji_forms = word.get("kanji", [])
+
+    if not kanji_forms:
+        return "kana_only", None
+
+    chars = _kanji_chars(kanji_forms)
 
-    max_priority = 0
-    max_level = levels_found[0]
-    for level in levels_found:
-        if level_priority.get(level, 0) > max_priority:
-            max_priority = level_priority[level]
-            max_level = level
+    levels_found = [kanji_jlpt_map[char] for char in chars.intersection(kanji_jlpt_map)]
+    jlpt_level = _hardest_level(levels_found) if levels_found else "non_jlpt"
 
-    return max_level
+    if strategy in ("average", "first"):
+        # Order- and repetition-sensitive strategies need the full scan
+        return jlpt_level, get_word_frequency_tier(word, kanji_tier_map, strategy)
+
+    tiers_found = [kanji_tier_map[char] for char in chars.intersection(kanji_tier_map)]
+    return jlpt_level, max(tiers_found) if tiers_found else None
 
 
 def is_common_word(word: Dict) -> bool:
@@ -281,43 +442,73 @@ def get_readings(word: Dict) -> List[str]:
     return readings
 
 
-def format_sense(sense: Dict, tags: Dict[str, str]) -> str:
-    """Format a single sense/meaning"""
+def _tag_labels(
+    codes: List[str],
+    tags: Dict[str, str],
+    label_memo: Optional[Dict[Tuple[str, ...], str]] = None,
+) -> str:
+    """
+    Join the display labels of tag codes (e.g. ["n", "vs"]) with "; ".
+
+    Part-of-speech and misc tag combinations repeat across most of JMdict,
+    so callers formatting many entries against one tags dict can pass a
+    label_memo dict to format each distinct combination only once.
+    """
+    if label_memo is None:
+        return "; ".join(filter(None, (tags.get(code, code) for code in codes)))
+
+    key = tuple(codes)
+    labels = label_memo.get(key)
+    if labels is None:
+        labels = label_memo[key] = "; ".join(
+            filter(None, (tags.get(code, code) for code in codes))
+        )
+    return labels
+
+
+def format_sense(
+    sense: Dict,
+    tags: Dict[str, str],
+    label_memo: Optional[Dict[Tuple[str, ...], str]] = None,
+) -> str:
+    """
+    Format a single sense/meaning
+
+    label_memo, if given, caches tag labels across calls that share the same
+    unchanged tags dict (see process_words).
+    """
+    get = sense.get
     parts = []
+    append = parts.append
 
     # Part of speech
-    pos_tags = []
-    for pos in sense.get("partOfSpeech", []):
-        tag_text = tags.get(pos, pos)
-        if tag_text:
-            pos_tags.append(tag_text)
-    if pos_tags:
-        parts.append(f"({'; '.join(pos_tags)})")
+    pos_labels = _tag_labels(get("partOfSpeech", ()), tags, label_memo)
+    if pos_labels:
+        append(f"({pos_labels})")
 
     # Glosses (meanings)
-    glosses = []
-    for gloss in sense.get("gloss", []):
-        if gloss.get("lang") == "eng":
-            text = gloss.get("text")
-            if text:
-                glosses.append(text)
+    glosses = "; ".join(
+        filter(
+            None,
+            [
+                gloss.get("text")
+                for gloss in get("gloss", ())
+                if gloss.get("lang") == "eng"
+            ],
+        )
+    )
     if glosses:
-        parts.append("; ".join(glosses))
+        append(glosses)
 
     # Additional info
-    info = sense.get("info", [])
+    info = get("info")
     if info:
-        parts.append(f"[{'; '.join(info)}]")
+        append(f"[{'; '.join(info)}]")
 
     # Misc tags
-    misc = sense.get("misc", [])
-    misc_labels = []
-    for m in misc:
-        tag_text = tags.get(m, m)
-        if tag_text:
-            misc_labels.append(tag_text)
+    misc_labels = _tag_labels(get("misc", ()), tags, label_memo)
     if misc_labels:
-        parts.append(f"<i>({'; '.join(misc_labels)})</i>")
+        append(f"<i>({misc_labels})</i>")
 
     return " ".join(parts)
 
@@ -335,11 +526,15 @@ def format_examples(examples: List[Dict], max_examples: int = 3) -> str:
 
         for sent in sentences:
             lang = sent.get("lang")
-            text = sent.get("text", "")
             if lang == "jpn":
-                japanese = text
+                japanese = sent.get("text", "")
             elif lang == "eng":
-                english = text
+                english = sent.get("text", "")
+            else:
+                continue
+            # Stop scanning once the pair is complete
+            if japanese and english:
+                break
 
         if japanese and english:
             formatted.append(f"{i}. {japanese}<br>→ {english}")
@@ -348,7 +543,10 @@ def format_examples(examples: List[Dict], max_examples: int = 3) -> str:
 
 
 def process_word(
-    word: Dict, tags: Dict[str, str], include_examples: bool = False
+    word: Dict,
+    tags: Dict[str, str],
+    include_examples: bool = False,
+    label_memo: Optional[Dict[Tuple[str, ...], str]] = None,
 ) -> Optional[Dict[str, Any]]:
     """
     Extract relevant fields from a word entry.
@@ -357,6 +555,7 @@ def process_word(
         word: JMdict word entry
         tags: Tag dictionary from JMdict
         include_examples: Whether to include example sentences
+        label_memo: Optional tag label cache shared by calls with the same tags
 
     Returns:
         Dictionary with processed word data or None if invalid
@@ -373,7 +572,7 @@ def process_word(
     all_examples = []
 
     for i, sense in enumerate(word.get("sense", [])):
-        sense_text = format_sense(sense, tags)
+        sense_text = format_sense(sense, tags, label_memo)
         if sense_text:
             senses.append(f"{i + 1}. {sense_text}")
 
@@ -400,3 +599,57 @@ def process_word(
         result["examples"] = "<br><br>".join(all_examples[:2])
 
     return result
+
+
+# process_word arguments shared by every task in a worker process,
+# installed once per worker by _init_word_worker
+_worker_args: Tuple[Dict[str, str], bool, Dict[Tuple[str, ...], str]] = (
+    {},
+    False,
+    {},
+)
+
+
+def _init_word_worker(tags: Dict[str, str], include_examples: bool) -> None:
+    """Pool initializer: receive the tags dict once instead of with every chunk"""
+    global _worker_args
+    _worker_args = (tags, include_examples, {})
+
+
+def _process_word_in_worker(word: Dict) -> Optional[Dict[str, Any]]:
+    """Run process_word with the arguments installed by _init_word_worker"""
+    tags, include_examples, label_memo = _worker_args
+    return process_word(word, tags, include_examples, label_memo)
+
+
+def process_words(
+    words: List[Dict],
+    tags: Dict[str, str],
+    include_examples: bool = False,
+    workers: Optional[int] = None,
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    Run process_word over a list of entries, in parallel for large inputs.
+
+    Entries are independent, so they are fanned out to a process pool in
+    chunks. Each worker receives tags once, through the pool initializer.
+    workers defaults to the CPU count. Small inputs, or a single worker, are
+    processed serially in this process.
+    Results are returned in input order (None for invalid entries).
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(words) < PARALLEL_MIN_WORDS:
+        worker = partial(
+            process_word,
+            tags=tags,
+            include_examples=include_examples,
+            label_memo={},
+        )
+        return list(map(worker, words))
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_word_worker,
+        initargs=(tags, include_examples),
+    ) as executor:
+        return list(executor.map(_process_word_in_worker, words, chunksize=2048))
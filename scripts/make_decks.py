@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Generate JLPT kanji and vocabulary Anki decks from a single entry point
+
+The "all" command parses Kanjidic2 and JMdict once and shares the parsed data
+between the kanji and vocabulary pipelines, instead of each script loading
+the same files again.
+
+Usage:
+    python make_decks.py --help
+    python make_decks.py all --examples -o decks/
+    python make_decks.py kanji --jmdict path/to/jmdict.json
+    python make_decks.py vocab --common-only
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from jmdict_utils import load_json, require_genanki
+from create_kanji_decks import (
+    add_arguments as add_kanji_arguments,
+    generate_kanji_decks,
+    load_kanjidic,
+    main as kanji_main,
+)
+from create_vocab_decks import (
+    add_arguments as add_vocab_arguments,
+    build_kanji_maps,
+    generate_vocab_decks,
+    main as vocab_main,
+    positive_int,
+)
+
+
+def run_all(args: argparse.Namespace) -> None:
+    """Generate kanji and vocabulary decks, loading each dictionary file once"""
+    jmdict_file = args.jmdict_examples if args.examples else args.jmdict
+
+    # Fail before the slow loading steps rather than once per deck
+    if args.apkg:
+        require_genanki()
+
+    for path in (args.kanjidic, jmdict_file):
+        if not path.exists():
+            print(f"Error: File not found: {path}", file=sys.stderr)
+            print("Please download from:", file=sys.stderr)
+            print(
+                "https://github.com/scriptin/jmdict-simplified/releases/latest",
+                file=sys.stderr,
+            )
+            sys.exit(1)
+
+    print("Loading Kanjidic2...")
+    kanjidic_data = load_kanjidic(args.kanjidic)
+    if "characters" not in kanjidic_data:
+        print(
+            "Error: Invalid kanjidic file - missing 'characters' key", file=sys.stderr
+        )
+        sys.exit(1)
+
+    kanji_jlpt_map, kanji_tier_map = build_kanji_maps(kanjidic_data)
+
+    print(
+        f"\nLoading JMdict ({'with examples' if args.examples else 'without examples'})..."
+    )
+    jmdict_data = load_json(jmdict_file)
+
+    print("\n" + "=" * 60)
+    print("KANJI DECKS")
+    print("=" * 60)
+    generate_kanji_decks(
+        kanjidic_data,
+        args.output_dir / "kanji",
+        jmdict_data=jmdict_data,
+        max_examples=args.max_examples,
+        apkg=args.apkg,
+    )
+
+    print("\n" + "=" * 60)
+    print("VOCABULARY DECKS")
+    print("=" * 60)
+    generate_vocab_decks(
+        jmdict_data,
+        kanji_jlpt_map,
+        kanji_tier_map,
+        args.output_dir / "vocabulary",
+        include_examples=args.examples,
+        common_only=args.common_only,
+        tier_strategy=args.tier_strategy,
+        workers=args.workers,
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(
+        description="Generate JLPT kanji and vocabulary Anki decks",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s all                       # Kanji and vocabulary decks
+  %(prog)s all --examples -o decks/  # Include example sentences
+  %(prog)s kanji --help              # Options of create_kanji_decks.py
+  %(prog)s vocab --help              # Options of create_vocab_decks.py
+        """,
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    kanji_parser = subparsers.add_parser("kanji", help="Generate kanji decks only")
+    add_kanji_arguments(kanji_parser)
+    kanji_parser.set_defaults(func=kanji_main)
+
+    vocab_parser = subparsers.add_parser("vocab", help="Generate vocabulary decks only")
+    add_vocab_arguments(vocab_parser)
+    vocab_parser.set_defaults(func=vocab_main)
+
+    all_parser = subparsers.add_parser(
+        "all", help="Generate kanji and vocabulary decks in one run"
+    )
+    all_parser.add_argument(
+        "--kanjidic",
+        type=Path,
+        default=Path("kanjidic2-en-3.6.2.json"),
+        help="Path to Kanjidic2 JSON file (default: kanjidic2-en-3.6.2.json)",
+    )
+    all_parser.add_argument(
+        "--jmdict",
+        type=Path,
+        default=Path("jmdict-eng-3.6.2.json"),
+        help="Path to JMdict JSON file (default: jmdict-eng-3.6.2.json)",
+    )
+    all_parser.add_argument(
+        "--jmdict-examples",
+        type=Path,
+        default=Path("jmdict-examples-eng-3.6.2.json"),
+        help=(
+            "Path to JMdict examples JSON file, used instead of --jmdict with "
+            "--examples (default: jmdict-examples-eng-3.6.2.json)"
+        ),
+    )
+    all_parser.add_argument(
+        "-e",
+        "--examples",
+        action="store_true",
+        help="Include example sentences in vocabulary decks",
+    )
+    all_parser.add_argument(
+        "--max-examples",
+        type=int,
+        default=3,
+        help="Maximum number of example words per kanji (default: 3)",
+    )
+    all_parser.add_argument(
+        "--common-only",
+        action="store_true",
+        help="Only include vocabulary marked as common",
+    )
+    all_parser.add_argument(
+        "--tier-strategy",
+        type=str,
+        choices=["conservative", "average", "first"],
+        default="conservative",
+        help="Strategy for calculating word frequency tier (default: conservative)",
+    )
+    all_parser.add_argument(
+        "-j",
+        "--workers",
+        type=positive_int,
+        default=None,
+        help="Number of worker processes for word processing (default: CPU count; 1 disables)",
+    )
+    all_parser.add_argument(
+        "--apkg",
+        action="store_true",
+        help="Write kanji decks as Anki packages (.apkg) (requires genanki)",
+    )
+    all_parser.add_argument(
+        "-o",
+        "--output-dir",
+        type=Path,
+        default=Path("anki_decks_general"),
+        help="Output directory, with kanji/ and vocabulary/ subdirectories "
+        "(default: anki_decks_general/)",
+    )
+    all_parser.set_defaults(func=run_all)
+
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
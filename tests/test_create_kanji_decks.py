@@ -7,12 +7,13 @@ import csv
 import json
 import sys
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
 
+from jmdict_utils import process_word
 from create_kanji_decks import (
     create_anki_csv,
     extract_dict_reference,
@@ -21,6 +22,7 @@ from create_kanji_decks import (
     extract_readings,
     find_example_words,
     format_back_field,
+    generate_kanji_decks,
     load_kanjidic,
     main,
     parse_args,
@@ -35,7 +37,16 @@ class TestLoadKanjidic:
         """Test loading valid JSON file"""
         test_file = tmp_path / "kanjidic.json"
         test_data = {"characters": [{"literal": "一"}]}
-        test_file.write_text(json.dumps(test_data))
+        test_file.write_bytes(json.dumps(test_data).encode("utf-8"))
+
+        result = load_kanjidic(test_file)
+        assert result == test_data
+
+    def test_load_unescaped_utf8(self, tmp_path):
+        """Test loading raw UTF-8 bytes, as in the published Kanjidic2 files"""
+        test_file = tmp_path / "kanjidic.json"
+        test_data = {"characters": [{"literal": "一", "misc": {"jlptLevel": 4}}]}
+        test_file.write_bytes(json.dumps(test_data, ensure_ascii=False).encode("utf-8"))
 
         result = load_kanjidic(test_file)
         assert result == test_data
@@ -488,6 +499,21 @@ class TestCreateAnkiCsv:
             )
             assert "N5" in rows[0]["tags"]
 
+    def test_tags_per_character(self, tmp_path):
+        """Test shared tag strings still follow each character's grade and tier"""
+        output_path = tmp_path / "test.csv"
+        characters = [
+            {"kanji": "一", "meanings": "one", "grade": 1, "tier": 1},
+            {"kanji": "二", "meanings": "two", "grade": 1, "tier": 1},
+            {"kanji": "三", "meanings": "three", "tier": 2},
+        ]
+
+        create_anki_csv(characters, output_path, "N5")
+
+        with open(output_path, "r", encoding="utf-8") as f:
+            tags = [row["tags"] for row in csv.DictReader(f)]
+        assert tags == ["N5 grade1 freq_tier1", "N5 grade1 freq_tier1", "N5 freq_tier2"]
+
     def test_empty_characters_list(self, tmp_path):
         """Test creating CSV with empty characters list"""
         output_path = tmp_path / "test.csv"
@@ -500,6 +526,25 @@ class TestCreateAnkiCsv:
             rows = list(reader)
             assert len(rows) == 0
 
+    def test_apkg_output(self, tmp_path):
+        """Test apkg=True writes an Anki package instead of a CSV"""
+        output_path = tmp_path / "test.csv"
+        characters = [{"kanji": "一", "meanings": "one", "grade": 1}]
+        genanki = MagicMock()
+
+        with patch.dict(sys.modules, {"genanki": genanki}):
+            create_anki_csv(characters, output_path, "N5", apkg=True)
+
+        assert not output_path.exists()
+        genanki.Deck.assert_called_once()
+        assert genanki.Deck.call_args[0][1] == "JLPT N5 Kanji"
+        note_kwargs = genanki.Note.call_args.kwargs
+        assert "one" in note_kwargs["fields"][1]
+        assert note_kwargs["tags"] == ["N5", "grade1"]
+        genanki.Package.return_value.write_to_file.assert_called_once_with(
+            str(tmp_path / "test.apkg")
+        )
+
 
 class TestParseArgs:
     """Tests for parse_args function"""
@@ -510,6 +555,7 @@ class TestParseArgs:
             args = parse_args()
             assert args.input == Path("kanjidic2-en-3.6.2.json")
             assert args.output_dir == Path("anki_decks")
+            assert args.apkg is False
 
     def test_custom_input(self):
         """Test custom input file"""
@@ -665,6 +711,84 @@ class TestMain:
         assert "N5" in tiers_called
         assert "N4" in tiers_called
 
+    @patch("create_kanji_decks.load_kanjidic")
+    def test_main_apkg_without_genanki(self, mock_load_kanjidic, tmp_path, capsys):
+        """Test --apkg without genanki exits once, before loading any data"""
+        input_file = tmp_path / "kanjidic.json"
+        input_file.write_text("{}")
+
+        with (
+            patch(
+                "sys.argv", ["create_kanji_decks.py", "-i", str(input_file), "--apkg"]
+            ),
+            patch.dict(sys.modules, {"genanki": None}),
+            pytest.raises(SystemExit) as exc_info,
+        ):
+            main()
+        assert exc_info.value.code == 1
+        mock_load_kanjidic.assert_not_called()
+        assert capsys.readouterr().err.count("requires genanki") == 1
+
+    @patch("create_kanji_decks.load_kanjidic")
+    def test_main_apkg_instructions(
+        self, mock_load_kanjidic, tmp_path, mock_kanjidic_data, capsys
+    ):
+        """Test apkg runs do not print the CSV field mapping instructions"""
+        mock_load_kanjidic.return_value = mock_kanjidic_data
+        input_file = tmp_path / "kanjidic.json"
+        input_file.write_text("{}")
+        output_dir = tmp_path / "output"
+
+        with (
+            patch(
+                "sys.argv",
+                [
+                    "create_kanji_decks.py",
+                    "-i",
+                    str(input_file),
+                    "-o",
+                    str(output_dir),
+                    "--apkg",
+                ],
+            ),
+            patch.dict(sys.modules, {"genanki": MagicMock()}),
+        ):
+            main()
+
+        out = capsys.readouterr().out
+        assert ".apkg file" in out
+        assert "Field mapping" not in out
+
+
+class TestGenerateKanjiDecks:
+    """Tests for generate_kanji_decks function"""
+
+    @pytest.fixture
+    def kanjidic_data(self):
+        """Fixture for Kanjidic data with one JLPT and one non-JLPT kanji"""
+        return {
+            "characters": [
+                {"literal": "一", "misc": {"jlptLevel": 4, "grade": 1}},
+                {"literal": "鬱", "misc": {}},
+            ]
+        }
+
+    @patch("create_kanji_decks.create_anki_csv")
+    def test_input_left_intact(self, mock_create_csv, tmp_path, kanjidic_data):
+        """Test the characters list is not modified by default"""
+        generate_kanji_decks(kanjidic_data, tmp_path)
+
+        assert len(kanjidic_data["characters"]) == 2
+        assert mock_create_csv.call_args[0][2] == "N5"
+
+    @patch("create_kanji_decks.create_anki_csv")
+    def test_release_input(self, mock_create_csv, tmp_path, kanjidic_data):
+        """Test release_input empties the characters list"""
+        generate_kanji_decks(kanjidic_data, tmp_path, release_input=True)
+
+        assert kanjidic_data["characters"] == []
+        assert mock_create_csv.call_args[0][2] == "N5"
+
 
 class TestFindExampleWords:
     """Tests for find_example_words function"""
@@ -762,6 +886,28 @@ class TestFindExampleWords:
         assert len(result) == 1
         assert result[0]["word"] == "学校"
 
+    def test_cache_reuses_processed_words(self):
+        """Test that cached words are processed only once across kanji"""
+        words_data = [
+            {
+                "id": "1206900",
+                "kanji": [{"text": "学校"}],
+                "kana": [{"text": "がっこう"}],
+                "sense": [{"gloss": [{"lang": "eng", "text": "school"}]}],
+            }
+        ]
+        cache = {}
+
+        with patch(
+            "create_kanji_decks.process_word", wraps=process_word
+        ) as mock_process:
+            first = find_example_words("学", words_data, {}, cache=cache)
+            second = find_example_words("校", words_data, {}, cache=cache)
+
+        assert mock_process.call_count == 1
+        assert first == second
+        assert cache["1206900"]["word"] == "学校"
+
 
 class TestFormatBackFieldWithExamples:
     """Tests for format_back_field with word examples"""
@@ -1346,7 +1492,7 @@ class TestScriptEntryPoint:
 
         # Create mock input file
         kanjidic_file = tmp_path / "kanjidic.json"
-        kanjidic_file.write_text(json.dumps({"characters": []}))
+        kanjidic_file.write_bytes(json.dumps({"characters": []}).encode("utf-8"))
         output_dir = tmp_path / "output"
 
         # Run the script as a subprocess
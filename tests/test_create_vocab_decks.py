@@ -197,6 +197,21 @@ class TestParseArgs:
             assert args.kanjidic == Path("kanjidic2-en-3.6.2.json")
             assert args.output_dir is None
             assert args.common_only is False
+            assert args.workers is None
+
+    def test_workers_flag(self):
+        """Test -j/--workers flag"""
+        with patch("sys.argv", ["create_vocab_decks.py", "-j", "1"]):
+            args = parse_args()
+            assert args.workers == 1
+
+    @pytest.mark.parametrize("value", ["0", "-2"])
+    def test_workers_flag_rejects_non_positive(self, value):
+        """Test -j/--workers rejects counts below 1"""
+        with patch("sys.argv", ["create_vocab_decks.py", "-j", value]):
+            with pytest.raises(SystemExit) as exc_info:
+                parse_args()
+            assert exc_info.value.code == 2
 
     def test_examples_flag(self):
         """Test --examples flag"""
@@ -476,6 +491,70 @@ class TestMain:
         assert output_dir.exists()
         assert mock_create_csv.called
 
+    @patch("create_vocab_decks.load_json")
+    @patch("create_vocab_decks.create_vocab_csv")
+    def test_main_counts_entries_with_examples(
+        self, mock_create_csv, mock_load_json, tmp_path, mock_kanjidic_data, capsys
+    ):
+        """Test entries with examples are counted during categorization"""
+        example = {
+            "sentences": [
+                {"lang": "jpn", "text": "私は学生です。"},
+                {"lang": "eng", "text": "I am a student."},
+            ]
+        }
+        mock_load_json.side_effect = [
+            mock_kanjidic_data,
+            {
+                "tags": {},
+                "words": [
+                    {
+                        "kanji": [{"text": "学生"}],
+                        "kana": [{"text": "がくせい"}],
+                        "sense": [
+                            {
+                                "gloss": [{"lang": "eng", "text": "student"}],
+                                "examples": [example],
+                            }
+                        ],
+                    },
+                    {
+                        "kanji": [{"text": "生"}],
+                        "kana": [{"text": "せい"}],
+                        "sense": [
+                            {
+                                "gloss": [{"lang": "eng", "text": "life"}],
+                                "examples": [],
+                            }
+                        ],
+                    },
+                ],
+            },
+        ]
+
+        jmdict_file = tmp_path / "jmdict_examples.json"
+        kanjidic_file = tmp_path / "kanjidic.json"
+        jmdict_file.write_text("{}")
+        kanjidic_file.write_text("{}")
+
+        with patch(
+            "sys.argv",
+            [
+                "create_vocab_decks.py",
+                "--jmdict-examples",
+                str(jmdict_file),
+                "--kanjidic",
+                str(kanjidic_file),
+                "-o",
+                str(tmp_path / "output"),
+                "-e",
+            ],
+        ):
+            main()
+
+        captured = capsys.readouterr()
+        assert "Entries with examples: 1" in captured.out
+
 
 class TestCreateVocabCsvWithTier:
     """Tests for create_vocab_csv with tier information"""
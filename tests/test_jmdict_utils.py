@@ -3,10 +3,11 @@
 Tests for jmdict_utils.py
 """
 
+import csv
 import json
 import sys
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -16,6 +17,9 @@ from jmdict_utils import (
     build_kanji_frequency_map,
     build_kanji_jlpt_map,
     calculate_frequency_tiers,
+    classify_word,
+    consume,
+    extract_reading_meaning,
     format_examples,
     format_sense,
     get_primary_form,
@@ -25,6 +29,9 @@ from jmdict_utils import (
     is_common_word,
     load_json,
     process_word,
+    process_words,
+    write_apkg,
+    write_csv,
 )
 
 
@@ -68,6 +75,75 @@ class TestLoadJson:
         assert result["emoji"] == "🎌"
 
 
+class TestWriteCsv:
+    """Tests for write_csv function"""
+
+    def test_writes_header_and_rows(self, tmp_path):
+        """Test header and rows round-trip through csv reader"""
+        output = tmp_path / "out.csv"
+        rows = [("日", 'a "quoted", <b>field</b>', "N5 grade1")]
+        write_csv(output, ["kanji", "back", "tags"], rows)
+
+        with open(output, newline="", encoding="utf-8") as f:
+            assert list(csv.reader(f)) == [["kanji", "back", "tags"], list(rows[0])]
+
+    def test_multiline_field(self, tmp_path):
+        """Test fields containing newlines are quoted"""
+        output = tmp_path / "out.csv"
+        write_csv(output, ["a"], [("line1\nline2",)])
+
+        with open(output, newline="", encoding="utf-8") as f:
+            assert list(csv.reader(f)) == [["a"], ["line1\nline2"]]
+
+
+class TestWriteApkg:
+    """Tests for write_apkg function"""
+
+    def test_missing_genanki_exits(self, tmp_path):
+        """Test a clear error when genanki is not installed"""
+        with (
+            patch.dict(sys.modules, {"genanki": None}),
+            pytest.raises(SystemExit) as exc_info,
+        ):
+            write_apkg(tmp_path / "out.apkg", "Deck", [("a", "b", "N5")])
+        assert exc_info.value.code == 1
+
+    def test_guid_follows_front(self, tmp_path):
+        """Test notes with the same front get the same guid whatever the back"""
+        genanki = MagicMock()
+        genanki.guid_for.side_effect = lambda *values: "guid:" + "|".join(values)
+        rows = [("一", "one", "N5"), ("一", "one, single", "N5"), ("二", "two", "N5")]
+
+        with patch.dict(sys.modules, {"genanki": genanki}):
+            write_apkg(tmp_path / "out.apkg", "Deck", rows)
+
+        guids = [call.kwargs["guid"] for call in genanki.Note.call_args_list]
+        assert guids[0] == guids[1]
+        assert guids[0] != guids[2]
+
+
+class TestConsume:
+    """Tests for consume function"""
+
+    def test_yields_in_order(self):
+        """Test items are yielded in their original order"""
+        items = [1, 2, 3]
+        assert list(consume(items)) == [1, 2, 3]
+
+    def test_list_is_emptied(self):
+        """Test consumed items are removed from the list"""
+        items = ["a", "b"]
+        gen = consume(items)
+        assert next(gen) == "a"
+        assert items == ["b"]
+        list(gen)
+        assert items == []
+
+    def test_empty_list(self):
+        """Test consuming an empty list"""
+        assert list(consume([])) == []
+
+
 class TestBuildKanjiJlptMap:
     """Tests for build_kanji_jlpt_map function"""
 
@@ -163,6 +239,27 @@ class TestBuildKanjiJlptMap:
         result = build_kanji_jlpt_map(data)
         assert result == {}
 
+    def test_out_of_range_level_skipped(self):
+        """Test levels outside the old 1-4 scale are skipped"""
+        data = {
+            "characters": [
+                {"literal": "零", "misc": {"jlptLevel": 0}},
+                {"literal": "五", "misc": {"jlptLevel": 5}},
+                {"literal": "負", "misc": {"jlptLevel": -1}},
+            ]
+        }
+        assert build_kanji_jlpt_map(data) == {}
+
+    def test_non_int_levels(self):
+        """Test float levels map like ints and string levels are skipped"""
+        data = {
+            "characters": [
+                {"literal": "食", "misc": {"jlptLevel": 3.0}},
+                {"literal": "文", "misc": {"jlptLevel": "3"}},
+            ]
+        }
+        assert build_kanji_jlpt_map(data) == {"食": "N4"}
+
 
 class TestGetWordJlptLevel:
     """Tests for get_word_jlpt_level function"""
@@ -231,6 +328,44 @@ class TestGetWordJlptLevel:
         assert result == "N4"
 
 
+class TestClassifyWord:
+    """Tests for classify_word function"""
+
+    def test_kana_only_word(self):
+        """Test kana-only words have no level tier"""
+        word = {"kanji": [], "kana": [{"text": "ひらがな"}]}
+        assert classify_word(word, {"一": "N5"}, {"一": 1}) == ("kana_only", None)
+
+    def test_level_and_tier(self):
+        """Test hardest level and conservative tier are returned together"""
+        word = {"kanji": [{"text": "曜日"}]}
+        jlpt_map = {"曜": "N4", "日": "N5"}
+        tier_map = {"曜": 4, "日": 1}
+        assert classify_word(word, jlpt_map, tier_map) == ("N4", 4)
+
+    def test_non_jlpt_without_tier(self):
+        """Test words with no mapped kanji"""
+        word = {"kanji": [{"text": "罕见"}]}
+        assert classify_word(word, {"日": "N5"}, {"日": 1}) == ("non_jlpt", None)
+
+    def test_word_not_modified(self):
+        """Test classifying leaves the JMdict entry untouched"""
+        word = {"kanji": [{"text": "学生"}, {"text": "學生"}]}
+        classify_word(word, {"学": "N3", "生": "N5"}, {"学": 2})
+        assert word == {"kanji": [{"text": "学生"}, {"text": "學生"}]}
+
+    @pytest.mark.parametrize("strategy", ["conservative", "average", "first", "x"])
+    def test_matches_separate_classifiers(self, strategy):
+        """Test results agree with get_word_jlpt_level/get_word_frequency_tier"""
+        word = {"kanji": [{"text": "日日月"}, {"text": "月曜"}]}
+        jlpt_map = {"日": "N5", "月": "N5", "曜": "N4"}
+        tier_map = {"日": 1, "月": 2, "曜": 4}
+        assert classify_word(word, jlpt_map, tier_map, strategy) == (
+            get_word_jlpt_level(word, jlpt_map),
+            get_word_frequency_tier(word, tier_map, strategy),
+        )
+
+
 class TestIsCommonWord:
     """Tests for is_common_word function"""
 
@@ -440,6 +575,35 @@ class TestFormatSense:
         result = format_sense(sense, tags)
         assert result == ""
 
+    def test_tag_labels_follow_tags_dict(self):
+        """Test tag labels are not cached between calls without a label_memo"""
+        sense = {"partOfSpeech": ["n"], "gloss": [{"lang": "eng", "text": "x"}]}
+        assert format_sense(sense, {"n": "noun"}) == "(noun) x"
+        assert format_sense(sense, {"n": "名詞"}) == "(名詞) x"
+
+        tags = {"n": "noun"}
+        assert format_sense(sense, tags) == "(noun) x"
+        tags["n"] = "NOUN"
+        assert format_sense(sense, tags) == "(NOUN) x"
+
+    def test_label_memo(self):
+        """Test a label_memo caches each tag combination once"""
+        sense = {
+            "partOfSpeech": ["n", "vs"],
+            "gloss": [{"lang": "eng", "text": "x"}],
+        }
+        label_memo = {}
+        tags = {"n": "noun", "vs": "suru verb"}
+        assert format_sense(sense, tags, label_memo) == "(noun; suru verb) x"
+        assert label_memo[("n", "vs")] == "noun; suru verb"
+        assert format_sense(sense, tags, label_memo) == "(noun; suru verb) x"
+
+    def test_empty_tag_labels_skipped(self):
+        """Test tags mapped to empty labels are dropped"""
+        sense = {"misc": ["a", "b"], "gloss": [{"lang": "eng", "text": "x"}]}
+        assert format_sense(sense, {"a": "", "b": ""}) == "x"
+        assert format_sense(sense, {"a": "", "b": "rare"}) == "x <i>(rare)</i>"
+
 
 class TestFormatExamples:
     """Tests for format_examples function"""
@@ -681,6 +845,73 @@ class TestProcessWord:
         assert result["is_common"] is False
 
 
+class TestProcessWords:
+    """Tests for process_words function"""
+
+    @staticmethod
+    def make_words(count):
+        return [
+            {
+                "kana": [{"text": f"かな{i}"}],
+                "sense": [{"gloss": [{"lang": "eng", "text": f"meaning {i}"}]}],
+            }
+            for i in range(count)
+        ]
+
+    def test_serial_matches_process_word(self):
+        """Test small inputs are processed in order like process_word"""
+        words = self.make_words(3) + [{"kana": [], "sense": []}]
+        results = process_words(words, {})
+        assert results == [process_word(w, {}) for w in words]
+        assert results[-1] is None
+
+    def test_parallel_preserves_order(self, monkeypatch):
+        """Test the process pool returns results in input order"""
+        monkeypatch.setattr("jmdict_utils.PARALLEL_MIN_WORDS", 0)
+        words = self.make_words(20)
+        results = process_words(words, {}, workers=2)
+        assert [r["word"] for r in results] == [f"かな{i}" for i in range(20)]
+
+    def test_parallel_passes_tags_and_examples(self, monkeypatch):
+        """Test worker processes receive tags and include_examples"""
+        monkeypatch.setattr("jmdict_utils.PARALLEL_MIN_WORDS", 0)
+        word = {
+            "kana": [{"text": "かな"}],
+            "sense": [
+                {
+                    "partOfSpeech": ["n"],
+                    "gloss": [{"lang": "eng", "text": "kana"}],
+                    "examples": [
+                        {
+                            "sentences": [
+                                {"lang": "jpn", "text": "かなです"},
+                                {"lang": "eng", "text": "It is kana"},
+                            ]
+                        }
+                    ],
+                }
+            ],
+        }
+        tags = {"n": "noun"}
+        results = process_words([word], tags, include_examples=True, workers=2)
+        assert results == [process_word(word, tags, include_examples=True)]
+        assert "(noun)" in results[0]["senses"]
+        assert "examples" in results[0]
+
+    def test_empty_input(self):
+        """Test empty word list"""
+        assert process_words([], {}) == []
+
+    def test_single_cpu_stays_serial(self, monkeypatch):
+        """Test the default worker count does not start a pool on one CPU"""
+        monkeypatch.setattr("jmdict_utils.PARALLEL_MIN_WORDS", 0)
+        monkeypatch.setattr("jmdict_utils.os.cpu_count", lambda: 1)
+        with patch("jmdict_utils.ProcessPoolExecutor") as mock_pool:
+            results = process_words(self.make_words(3), {})
+        mock_pool.assert_not_called()
+        assert len(results) == 3
+
+
 class TestLoadJsonGenericError:
     """Tests for generic exception handling in load_json"""
 
@@ -784,6 +1015,43 @@ class TestCalculateFrequencyTiers:
         assert result["八"] == 4
 
 
+class TestExtractReadingMeaning:
+    """Tests for extract_reading_meaning function"""
+
+    def test_no_reading_meaning(self):
+        """Test with None reading_meaning"""
+        assert extract_reading_meaning(None) == ([], [], [])
+
+    def test_readings_and_meanings_together(self):
+        """Test readings and meanings are collected in one pass"""
+        reading_meaning = {
+            "groups": [
+                {
+                    "readings": [
+                        {"type": "ja_on", "value": "ガク"},
+                        {"type": "ja_kun", "value": "まな.ぶ"},
+                        {"type": "pinyin", "value": "xue2"},
+                    ],
+                    "meanings": [
+                        {"lang": "en", "value": "study"},
+                        {"lang": "fr", "value": "étude"},
+                    ],
+                },
+                {"readings": [{"type": "ja_on", "value": "コウ"}]},
+            ]
+        }
+        on, kun, meanings = extract_reading_meaning(reading_meaning)
+        assert on == ["ガク", "コウ"]
+        assert kun == ["まな.ぶ"]
+        assert meanings == ["study"]
+
+    def test_other_language(self):
+        """Test selecting meanings in another language"""
+        reading_meaning = {"groups": [{"meanings": [{"lang": "fr", "value": "étude"}]}]}
+        _, _, meanings = extract_reading_meaning(reading_meaning, lang="fr")
+        assert meanings == ["étude"]
+
+
 class TestGetWordFrequencyTier:
     """Tests for get_word_frequency_tier function"""
 
@@ -808,3 +1076,21 @@ class TestGetWordFrequencyTier:
         kanji_tier_map = {"曜": 4, "日": 1}
         result = get_word_frequency_tier(word, kanji_tier_map, strategy="first")
         assert result == 4  # First kanji is 曜 (tier 4)
+
+    def test_conservative_across_forms(self):
+        """Test conservative takes the max over kanji of all forms"""
+        word = {"kanji": [{"text": "日々"}, {"text": "曜日"}]}
+        kanji_tier_map = {"曜": 4, "日": 1}
+        assert get_word_frequency_tier(word, kanji_tier_map) == 4
+
+    def test_conservative_no_tier_data(self):
+        """Test conservative returns None when no kanji has tier data"""
+        word = {"kanji": [{"text": "罕见"}]}
+        assert get_word_frequency_tier(word, {"日": 1}) is None
+
+    def test_average_counts_repeated_kanji(self):
+        """Test 'average' weighs each kanji occurrence"""
+        word = {"kanji": [{"text": "日日月"}]}  # tiers 1, 1, 4
+        kanji_tier_map = {"日": 1, "月": 4}
+        result = get_word_frequency_tier(word, kanji_tier_map, strategy="average")
+        assert result == 2  # ceil(6 / 3)
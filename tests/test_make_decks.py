@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Tests for make_decks.py
+"""
+
+import csv
+import json
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import make_decks
+from make_decks import main, parse_args
+
+
+@pytest.fixture
+def kanjidic_data():
+    """Fixture for minimal Kanjidic data"""
+    return {
+        "characters": [
+            {
+                "literal": "学",
+                "misc": {"jlptLevel": 2, "grade": 1, "frequency": 63},
+                "readingMeaning": {
+                    "groups": [
+                        {
+                            "readings": [{"type": "ja_on", "value": "ガク"}],
+                            "meanings": [{"lang": "en", "value": "study"}],
+                        }
+                    ]
+                },
+            },
+            {
+                "literal": "生",
+                "misc": {"jlptLevel": 4, "grade": 1, "frequency": 29},
+                "readingMeaning": {
+                    "groups": [
+                        {
+                            "readings": [{"type": "ja_on", "value": "セイ"}],
+                            "meanings": [{"lang": "en", "value": "life"}],
+                        }
+                    ]
+                },
+            },
+            {"literal": "鬱", "misc": {}},
+        ]
+    }
+
+
+@pytest.fixture
+def jmdict_data():
+    """Fixture for minimal JMdict data"""
+    return {
+        "tags": {"n": "noun"},
+        "words": [
+            {
+                "id": "1",
+                "kanji": [{"text": "学生", "common": True}],
+                "kana": [{"text": "がくせい", "common": True}],
+                "sense": [
+                    {
+                        "partOfSpeech": ["n"],
+                        "gloss": [{"lang": "eng", "text": "student"}],
+                    }
+                ],
+            },
+            {
+                "id": "2",
+                "kana": [{"text": "ああ"}],
+                "sense": [{"gloss": [{"lang": "eng", "text": "ah"}]}],
+            },
+        ],
+    }
+
+
+class TestParseArgs:
+    """Tests for parse_args function"""
+
+    def test_all_defaults(self):
+        """Test default arguments of the all command"""
+        with patch("sys.argv", ["make_decks.py", "all"]):
+            args = parse_args()
+            assert args.func is make_decks.run_all
+            assert args.kanjidic == Path("kanjidic2-en-3.6.2.json")
+            assert args.examples is False
+            assert args.output_dir == Path("anki_decks_general")
+
+    def test_kanji_uses_script_options(self):
+        """Test the kanji command accepts create_kanji_decks.py options"""
+        with patch("sys.argv", ["make_decks.py", "kanji", "-i", "k.json"]):
+            args = parse_args()
+            assert args.func is make_decks.kanji_main
+            assert args.input == Path("k.json")
+
+    def test_vocab_uses_script_options(self):
+        """Test the vocab command accepts create_vocab_decks.py options"""
+        with patch("sys.argv", ["make_decks.py", "vocab", "--common-only"]):
+            args = parse_args()
+            assert args.func is make_decks.vocab_main
+            assert args.common_only is True
+
+    def test_all_rejects_zero_workers(self):
+        """Test the all command rejects -j 0"""
+        with patch("sys.argv", ["make_decks.py", "all", "-j", "0"]):
+            with pytest.raises(SystemExit) as exc_info:
+                parse_args()
+            assert exc_info.value.code == 2
+
+    def test_command_required(self):
+        """Test a command must be given"""
+        with patch("sys.argv", ["make_decks.py"]), pytest.raises(SystemExit):
+            parse_args()
+
+
+class TestMain:
+    """Tests for main function"""
+
+    def test_all_loads_each_file_once(self, tmp_path, kanjidic_data, jmdict_data):
+        """Test all generates both deck types from a single parse of each file"""
+        kanjidic_file = tmp_path / "kanjidic.json"
+        jmdict_file = tmp_path / "jmdict.json"
+        kanjidic_file.write_text(json.dumps(kanjidic_data), encoding="utf-8")
+        jmdict_file.write_text(json.dumps(jmdict_data), encoding="utf-8")
+        output_dir = tmp_path / "decks"
+
+        with (
+            patch(
+                "sys.argv",
+                [
+                    "make_decks.py",
+                    "all",
+                    "--kanjidic",
+                    str(kanjidic_file),
+                    "--jmdict",
+                    str(jmdict_file),
+                    "-j",
+                    "1",
+                    "-o",
+                    str(output_dir),
+                ],
+            ),
+            patch(
+                "make_decks.load_kanjidic", wraps=make_decks.load_kanjidic
+            ) as mock_kanjidic,
+            patch("make_decks.load_json", wraps=make_decks.load_json) as mock_jmdict,
+        ):
+            main()
+
+        mock_kanjidic.assert_called_once()
+        mock_jmdict.assert_called_once()
+
+        kanji_csv = output_dir / "kanji" / "jlpt_N5_kanji.csv"
+        with open(kanji_csv, encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 1
+        assert "学生" in rows[0]["back"]  # Example word from shared JMdict
+
+        # Vocab levels come from the shared Kanjidic parse
+        assert (output_dir / "vocabulary" / "jlpt_N3_vocab.csv").exists()
+        assert (output_dir / "vocabulary" / "jlpt_kana_only_vocab.csv").exists()
+
+    def test_all_uses_examples_file(self, tmp_path, kanjidic_data, jmdict_data):
+        """Test --examples reads the JMdict examples file"""
+        kanjidic_file = tmp_path / "kanjidic.json"
+        examples_file = tmp_path / "jmdict-examples.json"
+        kanjidic_file.write_text(json.dumps(kanjidic_data), encoding="utf-8")
+        examples_file.write_text(json.dumps(jmdict_data), encoding="utf-8")
+        output_dir = tmp_path / "decks"
+
+        with patch(
+            "sys.argv",
+            [
+                "make_decks.py",
+                "all",
+                "--examples",
+                "--kanjidic",
+                str(kanjidic_file),
+                "--jmdict",
+                str(tmp_path / "missing.json"),
+                "--jmdict-examples",
+                str(examples_file),
+                "-o",
+                str(output_dir),
+            ],
+        ):
+            main()
+
+        assert (output_dir / "vocabulary" / "jlpt_N3_vocab_examples.csv").exists()
+
+    def test_all_missing_file(self, tmp_path):
+        """Test all exits when an input file is missing"""
+        with patch(
+            "sys.argv",
+            [
+                "make_decks.py",
+                "all",
+                "--kanjidic",
+                str(tmp_path / "missing.json"),
+            ],
+        ):
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+            assert exc_info.value.code == 1
+
+    def test_all_apkg_without_genanki(self, tmp_path, capsys):
+        """Test --apkg without genanki exits before loading any data"""
+        with (
+            patch(
+                "sys.argv",
+                [
+                    "make_decks.py",
+                    "all",
+                    "--apkg",
+                    "--kanjidic",
+                    str(tmp_path / "k.json"),
+                ],
+            ),
+            patch.dict(sys.modules, {"genanki": None}),
+            patch("make_decks.load_kanjidic") as mock_kanjidic,
+            pytest.raises(SystemExit) as exc_info,
+        ):
+            main()
+        assert exc_info.value.code == 1
+        mock_kanjidic.assert_not_called()
+        assert "requires genanki" in capsys.readouterr().err
+
+    def test_all_invalid_kanjidic(self, tmp_path):
+        """Test all exits when Kanjidic has no characters"""
+        kanjidic_file = tmp_path / "kanjidic.json"
+        jmdict_file = tmp_path / "jmdict.json"
+        kanjidic_file.write_text("{}")
+        jmdict_file.write_text("{}")
+
+        with patch(
+            "sys.argv",
+            [
+                "make_decks.py",
+                "all",
+                "--kanjidic",
+                str(kanjidic_file),
+                "--jmdict",
+                str(jmdict_file),
+            ],
+        ):
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+            assert exc_info.value.code == 1
+
+    def test_kanji_dispatches_to_script_main(self):
+        """Test the kanji command runs create_kanji_decks.main"""
+        with (
+            patch("sys.argv", ["make_decks.py", "kanji"]),
+            patch("make_decks.kanji_main") as mock_main,
+        ):
+            main()
+        mock_main.assert_called_once()
+        assert mock_main.call_args[0][0].input == Path("kanjidic2-en-3.6.2.json")